@@ -0,0 +1,3 @@
+# Tests import the sources as `core.*`. pytest puts this file's directory (the
+# repo root) on sys.path, so plain `pytest core/tests` resolves them without
+# any sys.path edits inside the test modules.
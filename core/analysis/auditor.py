@@ -1,4 +1,4 @@
-﻿from typing import Dict, List, Tuple, Union
+﻿from typing import Dict, List, Set, Tuple, Union
 
 from .baseline import build_baseline_keywords, compute_overlap
 from .consistency import compute_consistency
@@ -28,10 +28,12 @@ def _extract_names(items: List[Dict]) -> List[str]:
     return names
 
 
-def _annotate_list(items: List[Dict], compressed_data: Dict, consistency_scores: Dict[str, float]) -> List[Dict]:
-    title_entries = build_title_entries(compressed_data)
-    baseline_set = build_baseline_keywords(compressed_data)
-
+def _annotate_list(
+    items: List[Dict],
+    title_entries: List[Dict],
+    baseline_set: Set[str],
+    consistency_scores: Dict[str, float],
+) -> List[Dict]:
     features_map: Dict[str, Dict] = {}
     scores_raw: List[float] = []
 
@@ -95,16 +97,19 @@ def annotate_keywords(
         runs = [ _extract_names(base_items) ]
 
     consistency_scores = compute_consistency(runs)
+    # Shared by both keyword groups; both depend only on compressed_data.
+    title_entries = build_title_entries(compressed_data)
+    baseline_set = build_baseline_keywords(compressed_data)
 
     if isinstance(keywords, dict):
         out = dict(keywords)
         if "skills_interests" in out:
-            out["skills_interests"] = _annotate_list(out.get("skills_interests", []) or [], compressed_data, consistency_scores)
+            out["skills_interests"] = _annotate_list(out.get("skills_interests", []) or [], title_entries, baseline_set, consistency_scores)
         if "tools_platforms" in out:
-            out["tools_platforms"] = _annotate_list(out.get("tools_platforms", []) or [], compressed_data, consistency_scores)
+            out["tools_platforms"] = _annotate_list(out.get("tools_platforms", []) or [], title_entries, baseline_set, consistency_scores)
         return out
 
     if isinstance(keywords, list):
-        return _annotate_list(keywords, compressed_data, consistency_scores)
+        return _annotate_list(keywords, title_entries, baseline_set, consistency_scores)
 
     return keywords
@@ -1,4 +1,6 @@
+import heapq
 import re
+from collections import defaultdict
 from typing import Dict, List, Set
 
 
@@ -37,27 +39,27 @@ def build_baseline_keywords(compressed_data: Dict, limit: int = 50) -> Set[str]:
                     chat_token_weight = 0.4
     chat_token_weight = max(0.0, min(5.0, float(chat_token_weight)))
 
-    counter: Dict[str, float] = {}
+    counter: Dict[str, float] = defaultdict(float)
     web = compressed_data.get("web", {}) if isinstance(compressed_data, dict) else {}
     for stats in web.values():
         for title in stats.get("title_freq", {}).keys():
             for t in _tokenize(title):
                 if len(t) <= 1 or t in STOPWORDS:
                     continue
-                counter[t] = counter.get(t, 0.0) + 1.0
+                counter[t] += 1.0
 
     non_web = compressed_data.get("non_web_samples", {}) if isinstance(compressed_data, dict) else {}
     for sample in non_web.get("window", []) or []:
         for t in _tokenize(sample.get("title", "")):
             if len(t) <= 1 or t in STOPWORDS:
                 continue
-            counter[t] = counter.get(t, 0.0) + 0.6
+            counter[t] += 0.6
 
     for sample in non_web.get("audio", []) or []:
         for t in _tokenize(sample.get("title", "")):
             if len(t) <= 1 or t in STOPWORDS:
                 continue
-            counter[t] = counter.get(t, 0.0) + 0.4
+            counter[t] += 0.4
 
     chat_sessions = compressed_data.get("chat_sessions", []) if isinstance(compressed_data, dict) else []
     if isinstance(chat_sessions, list):
@@ -68,13 +70,12 @@ def build_baseline_keywords(compressed_data: Dict, limit: int = 50) -> Set[str]:
             for t in _tokenize(text):
                 if len(t) <= 1 or t in STOPWORDS:
                     continue
-                counter[t] = counter.get(t, 0.0) + chat_token_weight
+                counter[t] += chat_token_weight
 
     if not counter:
         return set()
 
-    sorted_items = sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))
-    return set([k for k, _ in sorted_items[:limit]])
+    return {k for k, _ in heapq.nsmallest(limit, counter.items(), key=lambda kv: (-kv[1], kv[0]))}
 
 
 def compute_overlap(candidate: str, baseline_set: Set[str]) -> float:
@@ -8,7 +8,8 @@ def _normalize(text: str) -> str:
 def build_title_entries(compressed_data: Dict) -> List[Dict]:
     """
     Build a list of title entries with estimated durations.
-    Each entry: {"title": str, "count": int, "duration": float}
+    Each entry: {"title": str, "count": int, "duration": float, "norm": str}
+    ("norm" is the normalized title, computed once instead of per candidate)
     """
     entries: List[Dict] = []
     web = compressed_data.get("web", {}) if isinstance(compressed_data, dict) else {}
@@ -73,6 +74,8 @@ def build_title_entries(compressed_data: Dict) -> List[Dict]:
             for line in lines:
                 entries.append({"title": line[:500], "count": 1, "duration": per_line_dur})
 
+    for entry in entries:
+        entry["norm"] = _normalize(entry["title"])
     return entries
 
 
@@ -86,19 +89,22 @@ def compute_evidence_features(candidate: str, title_entries: List[Dict]) -> Dict
     example_titles: List[str] = []
     distinct_titles = set()
 
-    for entry in title_entries:
-        title = entry.get("title", "")
-        if not title:
-            continue
-        title_norm = _normalize(title)
-        if key and key in title_norm:
-            count = int(entry.get("count", 0) or 0)
-            duration = float(entry.get("duration", 0) or 0)
-            support_count += max(0, count)
-            duration_seconds += max(0.0, duration)
-            distinct_titles.add(title)
-            if len(example_titles) < 3:
-                example_titles.append(title)
+    # Substring scan first (the hot part: every candidate against every title),
+    # then accumulate over the few matching entries only.
+    matches = [
+        entry
+        for entry in (title_entries if key else ())
+        if entry.get("title") and key in (entry.get("norm") or _normalize(entry["title"]))
+    ]
+    for entry in matches:
+        title = entry["title"]
+        count = int(entry.get("count", 0) or 0)
+        duration = float(entry.get("duration", 0) or 0)
+        support_count += max(0, count)
+        duration_seconds += max(0.0, duration)
+        distinct_titles.add(title)
+        if len(example_titles) < 3:
+            example_titles.append(title)
 
     evidence_types = []
     if support_count > 0:
@@ -245,6 +245,47 @@ def _pick_message_table(conn: sqlite3.Connection) -> Tuple[str, Dict[str, str]]:
     return table, mapping
 
 
+def _build_session(
+    items: List[Tuple[Optional[datetime], str, str]],
+    conv: str,
+    domain: str,
+    db_path: str,
+    cutoff: datetime,
+    max_chars: int,
+) -> Optional[ChatSession]:
+    items.sort(key=lambda x: (x[0] or datetime.min))
+    times = [t for t, _, _ in items if t is not None]
+    start_dt = min(times) if times else None
+    end_dt = max(times) if times else None
+    if end_dt is not None and end_dt < cutoff:
+        return None
+
+    lines = []
+    for t, role, content in items:
+        ts = t.isoformat(timespec="seconds") if isinstance(t, datetime) else ""
+        prefix = ""
+        if ts and role:
+            prefix = f"{ts} {role}: "
+        elif ts:
+            prefix = f"{ts} "
+        elif role:
+            prefix = f"{role}: "
+        lines.append(prefix + content)
+
+    raw_text = "\n".join(lines)
+    raw_text = redact_sensitive(raw_text)
+    compressed = compress_chat_text(raw_text, max_chars=max_chars)
+    if not compressed:
+        return None
+    return ChatSession(
+        domain=domain,
+        source=f"cherrystudio::{Path(db_path).name}::{conv}",
+        compressed_text=compressed,
+        start=start_dt.isoformat() if start_dt else None,
+        end=end_dt.isoformat() if end_dt else None,
+    )
+
+
 def extract_sessions(
     days: int = 7,
     domain: str = "cherrystudio",
@@ -311,15 +352,32 @@ def extract_sessions(
             )
 
         sql = f"SELECT {', '.join(select_cols)} FROM {msg_table}"
-        rows = conn.execute(sql).fetchall()
+        if "conv" in mapping:
+            # Rows of one conversation arrive together, so each session is
+            # built and released as soon as the next one starts instead of
+            # materializing the whole table first. Sort on the same key the
+            # loop groups by (text, whitespace-trimmed, empty -> "default"),
+            # so e.g. NULL and "default" or 1 and "1" stay adjacent.
+            sql += (
+                f" ORDER BY COALESCE(NULLIF(TRIM(CAST({mapping['conv']} AS TEXT), "
+                "char(32, 9, 10, 11, 12, 13)), ''), 'default')"
+            )
 
-        grouped: Dict[str, List[Tuple[Optional[datetime], str, str]]] = {}
-        for r in rows:
+        sessions: List[ChatSession] = []
+        current_conv: Optional[str] = None
+        items: List[Tuple[Optional[datetime], str, str]] = []
+        for r in conn.execute(sql):
             conv = ""
             if "conv" in mapping:
                 conv = str(r[mapping["conv"]] or "").strip()
             if not conv:
                 conv = "default"
+            if conv != current_conv:
+                if items:
+                    session = _build_session(items, current_conv, domain, db_path, cutoff, max_chars)
+                    if session is not None:
+                        sessions.append(session)
+                current_conv, items = conv, []
 
             t = None
             if "time" in mapping:
@@ -328,43 +386,12 @@ def extract_sessions(
             content = _coerce_message_text(r[mapping["content"]]) if "content" in mapping else ""
             if not content:
                 continue
-            grouped.setdefault(conv, []).append((t, role, content))
-
-        sessions: List[ChatSession] = []
-        for conv, items in grouped.items():
-            items.sort(key=lambda x: (x[0] or datetime.min))
-            times = [t for t, _, _ in items if t is not None]
-            start_dt = min(times) if times else None
-            end_dt = max(times) if times else None
-            if end_dt is not None and end_dt < cutoff:
-                continue
+            items.append((t, role, content))
 
-            lines = []
-            for t, role, content in items:
-                ts = t.isoformat(timespec="seconds") if isinstance(t, datetime) else ""
-                prefix = ""
-                if ts and role:
-                    prefix = f"{ts} {role}: "
-                elif ts:
-                    prefix = f"{ts} "
-                elif role:
-                    prefix = f"{role}: "
-                lines.append(prefix + content)
-
-            raw_text = "\n".join(lines)
-            raw_text = redact_sensitive(raw_text)
-            compressed = compress_chat_text(raw_text, max_chars=max_chars)
-            if not compressed:
-                continue
-            sessions.append(
-                ChatSession(
-                    domain=domain,
-                    source=f"cherrystudio::{Path(db_path).name}::{conv}",
-                    compressed_text=compressed,
-                    start=start_dt.isoformat() if start_dt else None,
-                    end=end_dt.isoformat() if end_dt else None,
-                )
-            )
+        if items:
+            session = _build_session(items, current_conv, domain, db_path, cutoff, max_chars)
+            if session is not None:
+                sessions.append(session)
 
         return sessions
     finally:
@@ -11,6 +11,11 @@ from .compress import compress_chat_text
 from .ingest import ChatSession
 from .sanitize import redact_sensitive
 
+try:
+    from json_utils import json_loads as _json_loads
+except ImportError:
+    from core.json_utils import json_loads as _json_loads
+
 
 @dataclass
 class CherryApiConfig:
@@ -71,7 +76,7 @@ def _http_get_json(url: str, headers: Dict[str, str] | None = None, timeout: int
     try:
         with urllib.request.urlopen(req, timeout=timeout) as resp:
             data = resp.read()
-            return json.loads(data.decode("utf-8", errors="replace"))
+            return _json_loads(data)
     except urllib.error.HTTPError as e:
         raise CherryStudioApiError(f"HTTP {e.code} for {url}") from e
     except urllib.error.URLError as e:
@@ -149,7 +154,7 @@ def _unwrap_spec(payload: Any) -> Any:
                         return inner
                 if isinstance(inner, str):
                     try:
-                        decoded = json.loads(inner)
+                        decoded = _json_loads(inner)
                         return _unwrap_spec(decoded)
                     except Exception:
                         pass
@@ -158,7 +163,7 @@ def _unwrap_spec(payload: Any) -> Any:
                 return v
     if isinstance(payload, str):
         try:
-            decoded = json.loads(payload)
+            decoded = _json_loads(payload)
             return _unwrap_spec(decoded)
         except Exception:
             return payload
@@ -15,7 +15,7 @@ except Exception:
 from analysis.auditor import annotate_keywords
 from chat.ingest import ingest_chat_sessions, save_chat_sessions_jsonl, select_recent_session_files
 from chat.sources import collect_chat_sessions
-from config import AppConfig, resolve_api_key
+from config import AppConfig, provider_env_key, resolve_api_key
 from llm.llm_client import create_llm_client
 from chat.obsidian_export import export_sessions_per_session
 
@@ -76,15 +76,7 @@ def main(argv: list[str] | None = None) -> int:
         llm_cfg = config.llm_config()
         provider = llm_cfg.get("provider", "zhipu")
         api_key = ""
-        key_map = {
-            "zhipu": "ZHIPU_API_KEY",
-            "doubao": "VOLCANO_API_KEY",
-            "openai": "OPENAI_API_KEY",
-            "openai_compat": "OPENAI_API_KEY",
-            "deepseek": "DEEPSEEK_API_KEY",
-            "dashscope": "DASHSCOPE_API_KEY",
-        }
-        env_key = key_map.get(provider, "")
+        env_key = provider_env_key(provider)
         if env_key:
             api_key = config.get_env(env_key)
         if not api_key:
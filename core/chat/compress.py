@@ -1,16 +1,23 @@
 import re
+from functools import lru_cache
 from typing import List, Tuple
 
 
 _CODE_FENCE_RE = re.compile(r"```[\\s\\S]*?```", re.MULTILINE)
+_HSPACE_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_TOOL_RE = re.compile(r"\\b(pip|npm|pnpm|yarn|conda|docker|kubectl|git)\\b")
+_FILE_EXT_RE = re.compile(r"\\b(py|ts|tsx|js|json|yaml|yml|toml|sql|md)\\b")
+_CODE_WORD_RE = re.compile(r"\\b(import|def|class|return|const|function|SELECT|UPDATE|INSERT)\\b")
+_RULE_RE = re.compile(r"[-=_]{6,}")
 
 
 def _normalize(text: str) -> str:
     if not text:
         return ""
     text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _HSPACE_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
 
@@ -27,6 +34,9 @@ def _extract_code_blocks(text: str, max_blocks: int, max_block_chars: int) -> Li
     return blocks
 
 
+# Sessions share boilerplate (system prompts, re-pasted errors), so identical
+# lines are scored once per process.
+@lru_cache(maxsize=4096)
 def _score_line(line: str) -> float:
     if not line:
         return 0.0
@@ -36,18 +46,18 @@ def _score_line(line: str) -> float:
         score += 3.0
     if "http://" in lower or "https://" in lower:
         score += 2.0
-    if re.search(r"\\b(pip|npm|pnpm|yarn|conda|docker|kubectl|git)\\b", lower):
+    if _TOOL_RE.search(lower):
         score += 2.0
-    if re.search(r"\\b(py|ts|tsx|js|json|yaml|yml|toml|sql|md)\\b", lower):
+    if _FILE_EXT_RE.search(lower):
         score += 1.0
-    if re.search(r"\\b(import|def|class|return|const|function|SELECT|UPDATE|INSERT)\\b", line):
+    if _CODE_WORD_RE.search(line):
         score += 1.5
     length = len(line)
     if length >= 40:
         score += 0.5
     if length >= 120:
         score += 0.5
-    if re.fullmatch(r"[-=_]{6,}", line.strip()):
+    if _RULE_RE.fullmatch(line.strip()):
         score -= 1.0
     return score
 
@@ -100,7 +110,11 @@ def compress_chat_text(
         picked.append(line)
         total += add_len
 
-    picked.sort(key=lambda s: text.find(s) if text.find(s) >= 0 else 10**9)
+    def _position(line: str) -> int:
+        pos = text.find(line)
+        return pos if pos >= 0 else 10**9
+
+    picked.sort(key=_position)
 
     out_parts: List[str] = []
     if picked:
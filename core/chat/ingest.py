@@ -1,4 +1,6 @@
 import json
+import os
+import tempfile
 import zipfile
 import hashlib
 from dataclasses import dataclass
@@ -202,7 +204,18 @@ def save_chat_sessions_jsonl(sessions: List[ChatSession], output_path: str) -> s
         if not isinstance(sess, ChatSession):
             continue
         lines.append(json.dumps(sess.to_dict(), ensure_ascii=False))
-    out_path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    # Write to a temp file and swap it in, so readers never see a half-written file
+    fd, tmp = tempfile.mkstemp(prefix=f".{out_path.name}.", suffix=".tmp", dir=str(out_path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        os.replace(tmp, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
     return str(out_path)
 
 
@@ -1,6 +1,9 @@
+import heapq
 import re
+from itertools import islice
 from urllib.parse import urlparse, urlunparse
-from typing import Dict, List
+from operator import itemgetter
+from typing import Dict, List, Tuple
 from collections import Counter, defaultdict
 from datetime import timedelta
 
@@ -246,26 +249,35 @@ class DataCleaner:
         app_stats: Dict = {}
         
         audio_agg = defaultdict(int)
-        afk_intervals = []
-        total_intervals = []
+        # (start, end, is_afk): total and AFK time are unioned in one sweep
+        spans = []
+
+        # The same URLs and titles recur across thousands of events; clean
+        # each distinct value once instead of re-running every regex per event.
+        cleaned_titles: Dict = {}
+        url_domains: Dict = {}
+
+        def _clean(text: str) -> str:
+            cleaned = cleaned_titles.get(text)
+            if cleaned is None:
+                cleaned = cleaned_titles[text] = cls.clean_title(text)
+            return cleaned
 
         for record in aw_records:
             duration = max(0, int(record.duration))
             if duration <= 0:
                 continue
             start = record.timestamp
-            end = start + timedelta(seconds=duration)
-            total_intervals.append((start, end))
-
             if record.event_type == "afk":
-                if str(record.status).lower() == "afk":
-                    afk_intervals.append((start, end))
+                spans.append((start, start + timedelta(seconds=duration), str(record.status).lower() == "afk"))
                 continue
+            spans.append((start, start + timedelta(seconds=duration), False))
 
             if record.event_type == "web":
-                clean_url = cls.clean_url(record.url)
-                domain = cls.extract_domain(clean_url)
-                clean_title = cls.clean_title(record.title)
+                domain = url_domains.get(record.url)
+                if domain is None:
+                    domain = url_domains[record.url] = cls.extract_domain(cls.clean_url(record.url))
+                clean_title = _clean(record.title)
 
                 # Chatbot Masking
                 is_chatbot = domain in cls.CHATBOT_DOMAINS
@@ -283,7 +295,7 @@ class DataCleaner:
                         "cnt": {"aw_events": 0},
                         "dur": {"active_seconds": 0},
                         "title_samples": [],
-                        "raw_titles_with_meta": [],
+                        "title_freq": Counter(),
                     }
 
                 target_map[domain]["cnt"]["aw_events"] += 1
@@ -292,15 +304,13 @@ class DataCleaner:
                 if len(target_map[domain]["title_samples"]) < 3:
                     target_map[domain]["title_samples"].append(clean_title)
 
-                target_map[domain]["raw_titles_with_meta"].append(
-                    {"title": clean_title, "visit_count": 1, "duration": record.duration}
-                )
+                target_map[domain]["title_freq"][clean_title] += 1
 
             elif record.event_type == "window":
                 if duration < cls.MIN_EVENT_SECONDS:
                     continue
-                title = cls.clean_title(record.title)
-                app = cls.clean_title(record.app)
+                title = _clean(record.title)
+                app = _clean(record.app)
                 if cls._is_noise_app(app) or cls._is_noise_title(title):
                     continue
                 
@@ -319,8 +329,8 @@ class DataCleaner:
             elif record.event_type == "audio":
                 if duration < cls.MIN_EVENT_SECONDS:
                     continue
-                title = cls.clean_title(record.title)
-                app = cls.clean_title(record.app)
+                title = _clean(record.title)
+                app = _clean(record.app)
                 if cls._is_noise_app(app) or cls._is_noise_title(title):
                     continue
                 # Audio still uses simple aggregation for now (less critical)
@@ -337,12 +347,8 @@ class DataCleaner:
                         unique_samples.append(title)
                 stats_map[domain]["title_samples"] = unique_samples
 
-            for domain, stats in stats_map.items():
-                title_freq = Counter()
-                for item in stats["raw_titles_with_meta"]:
-                    title_freq[item["title"]] += 1
-                stats["title_freq"] = dict(title_freq)
-                del stats["raw_titles_with_meta"]
+            for stats in stats_map.values():
+                stats["title_freq"] = dict(stats["title_freq"])
 
         _finalize_domain_stats(domain_stats)
         _finalize_domain_stats(chatbot_domain_stats)
@@ -354,7 +360,7 @@ class DataCleaner:
             # Limit titles to top N to avoid token overflow? 
             # User wants 0/1 logic, so we keep all unique titles but maybe limit count
             # Let's keep up to 20 unique titles per app for now to be safe
-            unique_titles = list(stats["titles"])[:20] 
+            unique_titles = list(islice(stats["titles"], 20))
             formatted_apps.append({
                 "app": app,
                 "duration": stats["duration"],
@@ -370,11 +376,9 @@ class DataCleaner:
                 for (app, title), dur in agg_map.items()
                 if title or app
             ]
-            items.sort(key=lambda x: (-x["duration"], x["app"], x["title"]))
-            return items[:limit]
+            return heapq.nsmallest(limit, items, key=lambda x: (-x["duration"], x["app"], x["title"]))
 
-        total_seconds = cls._union_seconds(total_intervals)
-        afk_seconds = cls._union_seconds(afk_intervals)
+        total_seconds, afk_seconds = cls._union_seconds(spans)
 
         compressed = {
             "meta": {
@@ -420,18 +424,36 @@ class DataCleaner:
         return False
 
     @staticmethod
-    def _union_seconds(intervals: List) -> int:
-        if not intervals:
-            return 0
-        intervals = sorted(intervals, key=lambda x: x[0])
-        total = 0
-        cur_start, cur_end = intervals[0]
-        for start, end in intervals[1:]:
-            if start <= cur_end:
+    def _union_seconds(spans: List) -> Tuple[int, int]:
+        """Return union seconds of all ``(start, end, flag)`` spans and of the flagged ones.
+
+        Flagged spans are a subsequence of the start-sorted list, so a single
+        sort and a single sweep serve both unions.
+        """
+        if not spans:
+            return 0, 0
+        spans = sorted(spans, key=itemgetter(0))
+        total = flagged = 0
+        cur_start = cur_end = None
+        flag_start = flag_end = None
+        for start, end, flag in spans:
+            if cur_end is not None and start <= cur_end:
                 if end > cur_end:
                     cur_end = end
             else:
-                total += int((cur_end - cur_start).total_seconds())
+                if cur_end is not None:
+                    total += int((cur_end - cur_start).total_seconds())
                 cur_start, cur_end = start, end
+            if not flag:
+                continue
+            if flag_end is not None and start <= flag_end:
+                if end > flag_end:
+                    flag_end = end
+            else:
+                if flag_end is not None:
+                    flagged += int((flag_end - flag_start).total_seconds())
+                flag_start, flag_end = start, end
         total += int((cur_end - cur_start).total_seconds())
-        return max(0, total)
+        if flag_end is not None:
+            flagged += int((flag_end - flag_start).total_seconds())
+        return max(0, total), max(0, flagged)
@@ -55,6 +55,8 @@ def run_collector(
             time.sleep(sample_interval)
     except KeyboardInterrupt:
         _log("[Collector] Stopped", log_file, quiet)
+    finally:
+        store.close()
 
 
 if __name__ == "__main__":
@@ -190,7 +190,8 @@ def _copy_db(src: str) -> str:
     return tmp.name
 
 
-def _read_chromium_history(db_path: str, since: datetime) -> Iterable[LocalEvent]:
+def _read_chromium_history(db_path: str, since: datetime) -> Iterable[tuple]:
+    """Yield ``EventStore.insert_events_bulk`` rows for Chromium visits since ``since``."""
     tmp_db = _copy_db(db_path)
     try:
         conn = sqlite3.connect(tmp_db)
@@ -205,17 +206,12 @@ def _read_chromium_history(db_path: str, since: datetime) -> Iterable[LocalEvent
             """,
             (threshold,),
         )
+        # Chromium stores microseconds since 1601-01-01; convert to Unix seconds directly.
+        epoch_offset = int((datetime(1970, 1, 1, tzinfo=timezone.utc) - chrome_epoch).total_seconds())
+        make_row = EventStore.make_row
         for url, title, last_visit_time in cursor.fetchall():
-            ts = chrome_epoch + timedelta(microseconds=int(last_visit_time or 0))
-            yield LocalEvent(
-                event_type="web",
-                url=url or "",
-                title=title or "",
-                app="",
-                status="",
-                duration=0,
-                timestamp=ts,
-            )
+            ts_start = int(last_visit_time or 0) // 1_000_000 - epoch_offset
+            yield make_row("web", url or "", title or "", "", "", 0, ts_start)
     finally:
         try:
             conn.close()
@@ -227,7 +223,8 @@ def _read_chromium_history(db_path: str, since: datetime) -> Iterable[LocalEvent
             pass
 
 
-def _read_firefox_history(db_path: str, since: datetime) -> Iterable[LocalEvent]:
+def _read_firefox_history(db_path: str, since: datetime) -> Iterable[tuple]:
+    """Yield ``EventStore.insert_events_bulk`` rows for Firefox visits since ``since``."""
     tmp_db = _copy_db(db_path)
     try:
         conn = sqlite3.connect(tmp_db)
@@ -242,17 +239,9 @@ def _read_firefox_history(db_path: str, since: datetime) -> Iterable[LocalEvent]
             """,
             (threshold,),
         )
+        make_row = EventStore.make_row
         for url, title, visit_date in cursor.fetchall():
-            ts = datetime.fromtimestamp(int(visit_date) / 1_000_000, tz=timezone.utc)
-            yield LocalEvent(
-                event_type="web",
-                url=url or "",
-                title=title or "",
-                app="",
-                status="",
-                duration=0,
-                timestamp=ts,
-            )
+            yield make_row("web", url or "", title or "", "", "", 0, int(visit_date) // 1_000_000)
     finally:
         try:
             conn.close()
@@ -289,9 +278,9 @@ def ingest_browser_history(store: EventStore, days: int, browsers: List[str]) ->
                 since = base_since
 
             if key in {"chrome", "edge"}:
-                inserted += store.insert_events(_read_chromium_history(db_path, since))
+                inserted += store.insert_events_bulk(list(_read_chromium_history(db_path, since)))
             elif key == "firefox":
-                inserted += store.insert_events(_read_firefox_history(db_path, since))
+                inserted += store.insert_events_bulk(list(_read_firefox_history(db_path, since)))
 
             store.set_meta(_meta_key(key, db_path), str(int(datetime.now(timezone.utc).timestamp())))
 
@@ -1,7 +1,49 @@
 import os
 import json
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+
+
+# One KEY=VALUE assignment per line; optional matching quotes around the value.
+# Comment and blank lines simply do not match.
+_ENV_LINE_RE = re.compile(rb"""^[ \t]*([A-Za-z_][A-Za-z0-9_.]*)[ \t]*=[ \t]*(["']?)(.*?)\2[ \t]*\r?$""", re.M)
+
+# Env var names holding each provider's API key, in lookup priority order.
+_PROVIDER_ENV_KEYS: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+    {
+        "zhipu": ("ZHIPU_API_KEY", "GLM_API_KEY", "BIGMODEL_API_KEY"),
+        "doubao": ("VOLCANO_API_KEY", "ARK_API_KEY"),
+        "openai": ("OPENAI_API_KEY",),
+        "openai_compat": ("OPENAI_API_KEY",),
+        "deepseek": ("DEEPSEEK_API_KEY",),
+        "dashscope": ("DASHSCOPE_API_KEY",),
+    }
+)
+
+
+FEISHU_APP_ENV_KEYS = ("FEISHU_APP_ID", "FEISHU_APP_SECRET", "FEISHU_EMAIL", "FEISHU_OPEN_ID", "FEISHU_MOBILES")
+
+
+@dataclass(frozen=True)
+class FeishuAppEnv:
+    """Feishu App-mode credentials and target user, read once per run."""
+
+    app_id: str = ""
+    app_secret: str = ""
+    email: str = ""
+    open_id: str = ""
+    mobiles: str = ""
+
+    @property
+    def has_target(self) -> bool:
+        return bool(self.email or self.open_id or self.mobiles)
+
+    @property
+    def target(self) -> str:
+        return self.email or self.mobiles or self.open_id
 
 
 def resolve_config_path(config_path: str) -> Path:
@@ -12,26 +54,39 @@ def resolve_config_path(config_path: str) -> Path:
     return path
 
 
+def read_env_file(env_path: str) -> Dict[str, str]:
+    """Parse a .env file (missing file -> empty dict)."""
+    values: Dict[str, str] = {}
+    try:
+        data = Path(env_path).read_bytes()
+    except OSError:
+        return values
+    if data.startswith(b"\xef\xbb\xbf"):
+        data = data[3:]
+    for match in _ENV_LINE_RE.finditer(data):
+        values[match.group(1).decode("utf-8")] = match.group(3).decode("utf-8", errors="replace")
+    return values
+
+
+def _env(name: str) -> str:
+    # Always the live environment: .env values are loaded into os.environ at startup
+    return os.environ.get(name) or ""
+
+
+def provider_env_key(provider: str) -> str:
+    """Return the primary env var name for ``provider``'s API key ("" if unknown)."""
+    keys = _PROVIDER_ENV_KEYS.get((provider or "").lower(), ())
+    return keys[0] if keys else ""
+
+
 def resolve_api_key(provider: str, configured_key: str) -> str:
     if configured_key:
         return configured_key
 
-    provider = (provider or "").lower()
-    if provider == "zhipu":
-        return (
-            os.environ.get("ZHIPU_API_KEY")
-            or os.environ.get("GLM_API_KEY")
-            or os.environ.get("BIGMODEL_API_KEY")
-            or ""
-        )
-    if provider == "doubao":
-        return os.environ.get("VOLCANO_API_KEY") or os.environ.get("ARK_API_KEY") or ""
-    if provider in {"openai", "openai_compat"}:
-        return os.environ.get("OPENAI_API_KEY") or ""
-    if provider == "deepseek":
-        return os.environ.get("DEEPSEEK_API_KEY") or ""
-    if provider == "dashscope":
-        return os.environ.get("DASHSCOPE_API_KEY") or ""
+    for name in _PROVIDER_ENV_KEYS.get((provider or "").lower(), ()):
+        value = _env(name)
+        if value:
+            return value
     return ""
 
 
@@ -96,7 +151,8 @@ class AppConfig:
         return self.resolve_path(self.section("collector").get("log_file", default))
 
     def llm_config(self) -> Dict:
-        llm = self.section("llm")
+        # Copy so callers (and concurrent runs) never mutate the cached config
+        llm = dict(self.section("llm"))
         provider = str(llm.get("provider", "") or "").strip().lower()
         base_model = str(llm.get("base_model", "") or "").strip().lower()
         base_url_examples = llm.get("base_url_examples", {}) or {}
@@ -148,8 +204,8 @@ class AppConfig:
         # We'll prioritize os.environ (which comes from .env or system), 
         # then fall back to config.json
         
-        # Check os.environ first
-        val = os.environ.get(key)
+        # Check os.environ first (.env values are loaded into it at startup)
+        val = _env(key)
         if val:
             return val
             
@@ -161,6 +217,10 @@ class AppConfig:
             
         return default
 
+    def feishu_app_env(self) -> FeishuAppEnv:
+        values = {key: self.get_env(key) for key in FEISHU_APP_ENV_KEYS}
+        return FeishuAppEnv(**{key[len("FEISHU_"):].lower(): values[key] for key in FEISHU_APP_ENV_KEYS})
+
     def output_config(self) -> Dict:
         return self.section("output")
 
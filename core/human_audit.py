@@ -1,6 +1,8 @@
 import sys
 import os
+import heapq
 import json
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urlparse
@@ -346,21 +348,20 @@ def _summarize_segment(compressed_data: Dict[str, Any]) -> Dict[str, Any]:
     for domain, stats in web_stats.items():
         dur = int(stats.get("dur", {}).get("active_seconds", 0))
         web_items.append((domain, dur))
-    web_items.sort(key=lambda x: (-x[1], x[0]))
-    top_web = [f"{d} ({max(1, s // 60)}m)" for d, s in web_items[:3]]
+    top_web = [f"{d} ({max(1, s // 60)}m)" for d, s in heapq.nsmallest(3, web_items, key=lambda x: (-x[1], x[0]))]
 
-    token_counts: Dict[str, int] = {}
+    token_counts: Dict[str, int] = defaultdict(int)
     for stats in web_stats.values():
         for title, count in (stats.get("title_freq", {}) or {}).items():
             for t in _tokenize(title):
-                token_counts[t] = token_counts.get(t, 0) + int(count or 1)
+                token_counts[t] += int(count or 1)
 
     for app in (compressed_data.get("non_web_samples", {}) or {}).get("window", []) or []:
         for title in app.get("titles", []) or []:
             for t in _tokenize(title):
-                token_counts[t] = token_counts.get(t, 0) + 1
+                token_counts[t] += 1
 
-    tags = [k for k, _ in sorted(token_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:3]]
+    tags = [k for k, _ in heapq.nsmallest(3, token_counts.items(), key=lambda kv: (-kv[1], kv[0]))]
 
     return {
         "top_apps": top_apps,
@@ -411,9 +412,13 @@ def _select_weight(item: Dict[str, Any]) -> float:
     return float(item.get("weight") or 0.0)
 
 
+def _keyword_rank(item: Dict[str, Any]) -> Tuple[float, str]:
+    return -_select_weight(item), str(item.get("name", "")).lower()
+
+
 def _trim_keywords(items: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
-    ranked = sorted(items, key=lambda x: (-_select_weight(x), str(x.get("name", "")).lower()))
-    return ranked[:limit]
+    # Same result as sorted(...)[:limit], via a bounded heap instead of a full sort
+    return heapq.nsmallest(limit, items, key=_keyword_rank)
 
 
 def _build_slice_keywords(
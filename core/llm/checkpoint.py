@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class LLMCheckpoint:
+    """On-disk cache of successful ``(payload, meta)`` LLM results keyed by input hash.
+
+    Entries live in ``{cache_dir}/{key}.json`` and expire after ``ttl_seconds``.
+    Only results that actually came from the LLM (no fallback) are stored, so a
+    failed run never poisons later ones.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = 6 * 3600, enabled: bool = True) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = float(ttl_seconds)
+        self.enabled = bool(enabled) and self.ttl_seconds > 0
+
+    @classmethod
+    def from_llm_config(cls, llm_cfg: Dict, resolve_path: Callable[[str], str]) -> "LLMCheckpoint":
+        cfg = llm_cfg.get("checkpoint", {}) if isinstance(llm_cfg, dict) else {}
+        if not isinstance(cfg, dict):
+            cfg = {}
+        try:
+            ttl_hours = float(cfg.get("ttl_hours", 6))
+        except Exception:
+            ttl_hours = 6.0
+        cache_dir = resolve_path(str(cfg.get("dir", "") or "outputs/.cache"))
+        return cls(cache_dir, ttl_seconds=ttl_hours * 3600, enabled=bool(cfg.get("enabled", True)))
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Tuple[Any, Dict]]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return data["payload"], dict(data["meta"])
+        except Exception:
+            return None
+
+    def save(self, key: str, payload: Any, meta: Dict) -> None:
+        if not self.enabled:
+            return
+        tmp = ""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=str(self.cache_dir))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"payload": payload, "meta": meta}, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except Exception:
+            # e.g. an unserializable payload: do not leave the partial temp file behind
+            if tmp:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    def call(self, key: str, fn: Callable[[], Tuple[Any, Dict]]) -> Tuple[Any, Dict, bool]:
+        """Return ``(payload, meta, hit)``, invoking ``fn`` only on a cache miss."""
+        cached = self.load(key)
+        if cached is not None:
+            return cached[0], cached[1], True
+        payload, meta = fn()
+        if isinstance(meta, dict) and meta.get("used_llm") and not meta.get("fallback_used"):
+            self.save(key, payload, meta)
+        return payload, meta, False
@@ -1,8 +1,15 @@
-import json
+import heapq
 import re
+from collections import defaultdict
 from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from json_utils import json_loads as _json_loads
+except ImportError:
+    from core.json_utils import json_loads as _json_loads
 
 try:
     import prompts
@@ -16,6 +23,11 @@ except ImportError:
         pass
 
 
+def _by_count_desc(kv):
+    # Top-K order for (name, count) pairs: count desc, then name asc.
+    return -kv[1], kv[0]
+
+
 class LLMClient:
     def __init__(self, provider: str, api_key: str, model: str, timeout: int = 60, base_url: str = ""):
         self.provider = provider
@@ -23,6 +35,11 @@ class LLMClient:
         self.model = model
         self.timeout = timeout
         self.base_url = base_url.rstrip("/")
+        # Keep-alive pool shared by every call on this client, so repeated and
+        # concurrent requests to the same provider skip the TCP/TLS handshake.
+        # Retries stay in llm.retry.with_retry, which also honours 429/5xx.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
     CONTAINERS = {
         'msedge.exe', 'chrome.exe', 'code.exe', 'idea64.exe', 'explorer.exe',
@@ -37,11 +54,14 @@ class LLMClient:
             status_code: Optional[int] = None,
             url: str = "",
             body_excerpt: str = "",
+            transient: bool = False,
         ) -> None:
             super().__init__(message)
             self.status_code = status_code
             self.url = url
             self.body_excerpt = body_excerpt
+            # Timeout / connection failure with no HTTP status (worth retrying)
+            self.transient = transient
 
     def extract_keywords(
         self,
@@ -109,6 +129,7 @@ class LLMClient:
             meta["error"] = str(e)
             if isinstance(e, LLMClient.RequestError):
                 meta["http_status"] = e.status_code
+                meta["transient"] = e.transient
             
         # Fallback to rule-based
         fallback = self._rule_based_keywords(compressed_data, min_k, max_k)
@@ -169,32 +190,32 @@ class LLMClient:
             meta["error"] = str(e)
             if isinstance(e, LLMClient.RequestError):
                 meta["http_status"] = e.status_code
+                meta["transient"] = e.transient
 
         stop = {
             "the", "and", "for", "with", "from", "that", "this", "you", "your", "are",
             "how", "what", "why", "when", "where", "use", "using", "into", "over", "new",
             "教程", "下载", "官网", "登录", "注册", "配置", "安装", "使用", "指南", "文档",
         }
-        counter = {}
+        counter = defaultdict(float)
         tokens = re.split(r"[^A-Za-z0-9\u4e00-\u9fa5]+", combined_text)
         for t in tokens:
             t = t.strip().lower()
             if not t or t in stop or len(t) <= 1:
                 continue
-            counter[t] = counter.get(t, 0.0) + 1.0
+            counter[t] += 1.0
 
-        sorted_items = sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))
-        top = sorted_items[: max(1, skills_limit)]
+        top = heapq.nsmallest(max(1, skills_limit), counter.items(), key=_by_count_desc)
         max_count = max([v for _, v in top] or [1.0])
         skills = [{"name": k, "weight": (v / max_count if max_count else 0.5)} for k, v in top]
 
-        domain_counter = {}
+        domain_counter = defaultdict(int)
         for s in chat_sessions:
             d = str(s.get("domain", "") or "").strip()
             if not d:
                 continue
-            domain_counter[d] = domain_counter.get(d, 0) + 1
-        tool_items = sorted(domain_counter.items(), key=lambda kv: (-kv[1], kv[0]))[: max(1, tools_limit)]
+            domain_counter[d] += 1
+        tool_items = heapq.nsmallest(max(1, tools_limit), domain_counter.items(), key=_by_count_desc)
         max_dc = max([v for _, v in tool_items] or [1])
         tools = [{"name": d, "weight": (c / max_dc if max_dc else 0.5)} for d, c in tool_items]
 
@@ -269,10 +290,7 @@ class LLMClient:
             ],
             "temperature": 0.3,
         }
-        resp = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
-        resp.raise_for_status()
-        data = resp.json()
-        return data["choices"][0]["message"]["content"]
+        return self._post_chat(url, headers, payload)
 
     def _call_openai_compat(self, prompt: str) -> str:
         if not self.base_url:
@@ -288,8 +306,12 @@ class LLMClient:
             ],
             "temperature": 0.3,
         }
+        return self._post_chat(url, headers, payload)
+
+    def _post_chat(self, url: str, headers: Dict, payload: Dict) -> str:
+        """POST a chat completion; every failure surfaces as ``RequestError``."""
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
+            resp = self._session.post(url, headers=headers, json=payload, timeout=self.timeout)
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
             status = None
@@ -318,10 +340,11 @@ class LLMClient:
             raise LLMClient.RequestError(msg, status_code=status, url=url, body_excerpt=body_excerpt) from e
         except requests.exceptions.RequestException as e:
             msg = f"LLM request failed: {type(e).__name__} for url={url}: {e}"
-            raise LLMClient.RequestError(msg, status_code=None, url=url, body_excerpt="") from e
+            transient = isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+            raise LLMClient.RequestError(msg, status_code=None, url=url, body_excerpt="", transient=transient) from e
 
         try:
-            data = resp.json()
+            data = _json_loads(resp.content)
         except Exception as e:
             raise LLMClient.RequestError(f"LLM response is not valid JSON for url={url}: {e}", url=url) from e
         try:
@@ -356,7 +379,7 @@ class LLMClient:
             return None
 
         try:
-            payload = json.loads(text[start : end + 1])
+            payload = _json_loads(text[start : end + 1])
         except Exception:
             return None
 
@@ -392,7 +415,7 @@ class LLMClient:
             "教程", "下载", "官网", "登录", "注册", "配置", "安装", "使用", "指南", "文档",
         }
 
-        counter = {}
+        counter = defaultdict(float)
         web = compressed_data.get("web", {}) if isinstance(compressed_data, dict) else {}
         for stats in web.values():
             for title in stats.get("title_samples", []):
@@ -401,7 +424,7 @@ class LLMClient:
                     t = t.strip().lower()
                     if not t or t in stop or len(t) <= 1:
                         continue
-                    counter[t] = counter.get(t, 0.0) + 1.0
+                    counter[t] += 1.0
 
         non_web = compressed_data.get("non_web_samples", {}) if isinstance(compressed_data, dict) else {}
         for sample in non_web.get("window", []):
@@ -411,7 +434,7 @@ class LLMClient:
                     t = t.strip().lower()
                     if not t or t in stop or len(t) <= 1:
                         continue
-                    counter[t] = counter.get(t, 0.0) + 0.6
+                    counter[t] += 0.6
 
         for sample in non_web.get("audio", []):
             for text in [sample.get("title", ""), sample.get("app", "")]:
@@ -420,10 +443,9 @@ class LLMClient:
                     t = t.strip().lower()
                     if not t or t in stop or len(t) <= 1:
                         continue
-                    counter[t] = counter.get(t, 0.0) + 0.4
+                    counter[t] += 0.4
 
-        sorted_items = sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))
-        top = sorted_items[:max_k]
+        top = heapq.nsmallest(max_k, counter.items(), key=_by_count_desc)
         if not top:
             return []
 
@@ -0,0 +1,108 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, TypeVar
+
+import requests
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryConfig:
+    max_retries: int = 3
+    initial_delay: float = 0.5
+    backoff_factor: float = 2.0
+    max_delay: float = 30.0
+
+    @classmethod
+    def from_llm_config(cls, llm_cfg: Dict) -> "RetryConfig":
+        retry = llm_cfg.get("retry", {}) if isinstance(llm_cfg, dict) else {}
+        if not isinstance(retry, dict):
+            retry = {}
+        default = cls()
+        try:
+            return cls(
+                max_retries=max(0, int(retry.get("max_retries", default.max_retries))),
+                initial_delay=max(0.0, float(retry.get("initial_delay", default.initial_delay))),
+                backoff_factor=max(1.0, float(retry.get("backoff_factor", default.backoff_factor))),
+                max_delay=max(0.0, float(retry.get("max_delay", default.max_delay))),
+            )
+        except Exception:
+            return default
+
+    def delay_for(self, attempt: int) -> float:
+        return min(self.max_delay, self.initial_delay * (self.backoff_factor ** attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire()`` blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = max(0.0, float(rate))
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_transient_meta(meta: Optional[Dict]) -> bool:
+    """True when an LLM meta dict reports a failure worth retrying (429/5xx/timeouts)."""
+    if not isinstance(meta, dict) or meta.get("used_llm"):
+        return False
+    if meta.get("http_status") in RETRYABLE_STATUS:
+        return True
+    # Set by the client from the exception type (timeout / connection error)
+    return meta.get("http_status") is None and bool(meta.get("transient"))
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    if isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError, TimeoutError)):
+        return True
+    return getattr(exc, "status_code", None) in RETRYABLE_STATUS or bool(getattr(exc, "transient", False))
+
+
+def with_retry(
+    fn: Callable[[], T],
+    cfg: Optional[RetryConfig] = None,
+    limiter: Optional[TokenBucket] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Call ``fn`` with exponential backoff on transient failures.
+
+    ``fn`` may either raise, or return a ``(payload, meta)`` tuple as produced by
+    the LLM client with ``return_meta=True``; in the latter case the meta dict
+    decides whether the attempt is retried. The last result is returned as-is.
+    """
+    cfg = cfg or RetryConfig()
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            result = fn()
+        except Exception as e:
+            if attempt >= cfg.max_retries or not is_transient_error(e):
+                raise
+        else:
+            meta = result[1] if isinstance(result, tuple) and len(result) == 2 else None
+            if attempt >= cfg.max_retries or not is_transient_meta(meta):
+                return result
+        sleep(cfg.delay_for(attempt))
+        attempt += 1
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Field names of the DataCleaner.compress_data layout. They repeat for every
+# domain and app, so counting them as terms would make any two windows look alike.
+_SCHEMA_KEYS = frozenset(
+    {
+        "meta", "afk_seconds", "total_seconds", "afk_ratio",
+        "web", "cnt", "aw_events", "dur", "active_seconds", "title_samples", "title_freq",
+        "chatbot", "pool_seconds", "domains", "token_weight",
+        "non_web_samples", "window", "audio", "app", "duration", "titles", "title",
+        "chat_sessions", "session_id", "domain", "source", "start", "end", "compressed_text",
+    }
+)
+
+
+def feature_vector(data: Any) -> Dict[str, float]:
+    """Bag-of-terms embedding of a JSON-like structure.
+
+    Content becomes terms: mapping keys such as domains and titles, and string
+    leaves such as apps and window titles. Schema field names (``_SCHEMA_KEYS``)
+    and numbers are ignored, so windows that differ only in durations still match.
+    """
+    counts: Counter = Counter()
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for k, v in node.items():
+                k = str(k)
+                if k not in _SCHEMA_KEYS:
+                    counts[k] += 1
+                stack.append(v)
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif isinstance(node, str) and node:
+            counts[node] += 1
+    return dict(counts)
+
+
+def _norm(vec: Dict[str, float]) -> float:
+    return math.sqrt(sum(v * v for v in vec.values()))
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float], norm_a: float, norm_b: float) -> float:
+    if norm_a <= 0 or norm_b <= 0:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items()) / (norm_a * norm_b)
+
+
+class SemanticPromptCache:
+    """SQLite-backed cache of LLM results that also matches near-duplicate inputs.
+
+    Lookups first try an exact blake2b hash of the input, then fall back to the
+    most similar recent entry in the same ``scope`` (model + prompt parameters)
+    whose cosine similarity is at least ``threshold``. Like ``LLMCheckpoint``,
+    only results that actually came from the LLM are stored.
+    """
+
+    _MAX_CANDIDATES = 64
+
+    def __init__(
+        self,
+        db_path: str,
+        threshold: float = 0.92,
+        ttl_seconds: float = 3600,
+        enabled: bool = True,
+        embed_fn: Callable[[Any], Dict[str, float]] = feature_vector,
+    ) -> None:
+        self.db_path = str(db_path)
+        self.threshold = float(threshold)
+        self.ttl_seconds = float(ttl_seconds)
+        self.enabled = bool(enabled) and self.ttl_seconds > 0
+        self.embed_fn = embed_fn
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @classmethod
+    def from_llm_config(cls, llm_cfg: Dict, resolve_path: Callable[[str], str]) -> "SemanticPromptCache":
+        cfg = llm_cfg.get("semantic_cache", {}) if isinstance(llm_cfg, dict) else {}
+        if not isinstance(cfg, dict):
+            cfg = {}
+        try:
+            threshold = float(cfg.get("threshold", 0.92))
+            ttl_hours = float(cfg.get("ttl_hours", 1))
+        except Exception:
+            threshold, ttl_hours = 0.92, 1.0
+        db_path = resolve_path(str(cfg.get("path", "") or "outputs/.cache/semantic_cache.db"))
+        return cls(db_path, threshold=threshold, ttl_seconds=ttl_hours * 3600, enabled=bool(cfg.get("enabled", False)))
+
+    @staticmethod
+    def exact_key(scope: str, data: Any) -> str:
+        raw = json.dumps([scope, data], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        if not self._ready:
+            with self._lock:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS semantic_cache (
+                        key TEXT PRIMARY KEY,
+                        scope TEXT NOT NULL,
+                        vec TEXT NOT NULL,
+                        norm REAL NOT NULL,
+                        payload TEXT NOT NULL,
+                        meta TEXT NOT NULL,
+                        ts REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_semantic_scope_ts ON semantic_cache(scope, ts)")
+                conn.commit()
+                self._ready = True
+        return conn
+
+    def lookup(self, scope: str, data: Any) -> Optional[Tuple[Any, Dict, float]]:
+        """Return ``(payload, meta, score)`` for the best match, or None."""
+        if not self.enabled:
+            return None
+        try:
+            cutoff = time.time() - self.ttl_seconds
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT payload, meta FROM semantic_cache WHERE key = ? AND ts >= ?",
+                    (self.exact_key(scope, data), cutoff),
+                ).fetchone()
+                if row:
+                    return json.loads(row[0]), json.loads(row[1]), 1.0
+                rows = conn.execute(
+                    "SELECT vec, norm, payload, meta FROM semantic_cache WHERE scope = ? AND ts >= ? ORDER BY ts DESC LIMIT ?",
+                    (scope, cutoff, self._MAX_CANDIDATES),
+                ).fetchall()
+            finally:
+                conn.close()
+        except Exception:
+            return None
+        if not rows:
+            return None
+        vec = self.embed_fn(data)
+        norm = _norm(vec)
+        best = None
+        best_score = self.threshold
+        for vec_json, row_norm, payload, meta in rows:
+            score = cosine(vec, json.loads(vec_json), norm, row_norm)
+            if score >= best_score:
+                best, best_score = (payload, meta), score
+        if best is None:
+            return None
+        return json.loads(best[0]), json.loads(best[1]), best_score
+
+    def save(self, scope: str, data: Any, payload: Any, meta: Dict) -> None:
+        if not self.enabled:
+            return
+        try:
+            vec = self.embed_fn(data)
+            now = time.time()
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM semantic_cache WHERE ts < ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO semantic_cache (key, scope, vec, norm, payload, meta, ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self.exact_key(scope, data),
+                        scope,
+                        json.dumps(vec, ensure_ascii=False),
+                        _norm(vec),
+                        json.dumps(payload, ensure_ascii=False),
+                        json.dumps(meta, ensure_ascii=False),
+                        now,
+                    ),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception:
+            pass
+
+    def call(self, scope: str, data: Any, fn: Callable[[], Tuple[Any, Dict]]) -> Tuple[Any, Dict, Optional[float]]:
+        """Return ``(payload, meta, score)``; ``score`` is None when ``fn`` was invoked."""
+        cached = self.lookup(scope, data)
+        if cached is not None:
+            return cached
+        payload, meta = fn()
+        if isinstance(meta, dict) and meta.get("used_llm") and not meta.get("fallback_used"):
+            self.save(scope, data, payload, meta)
+        return payload, meta, None
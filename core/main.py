@@ -1,6 +1,15 @@
 import argparse
+import datetime
+import hashlib
+import heapq
+import json
+import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple
 from urllib.parse import urlparse
 
 try:
@@ -13,41 +22,33 @@ try:
 except Exception:
     from pusher.push_gate import compute_feishu_push_decision
 
-from cleaner.data_cleaner import DataCleaner
-from config import AppConfig, resolve_api_key, resolve_config_path
-from collectors.aw_collector import ActivityWatchCollector
-from llm.llm_client import create_llm_client
-from analysis.auditor import annotate_keywords
-from visualization.wordcloud import WordCloudGenerator
-from pusher.feishu_pusher import FeishuPusher
-from storage.event_store import EventStore
-from chat.ingest import load_chat_sessions_file, save_chat_sessions_jsonl
-from chat.merge import merge_keyword_payloads
-from chat.sources import collect_chat_sessions
-from chat.obsidian_export import export_sessions_per_session
+from config import AppConfig, provider_env_key, read_env_file, resolve_api_key, resolve_config_path
+
+# Pipeline modules (and their requests/sqlite dependencies) are imported
+# where they are used, so `--help` and the sleeping scheduler start fast.
+if TYPE_CHECKING:
+    from llm.retry import TokenBucket
+    from pusher.feishu_pusher import FeishuPusher
+
+
+_ENV_LOADED = False
 
 
 def load_env() -> None:
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    _ENV_LOADED = True
+
     if load_dotenv:
         load_dotenv()
         return
 
     # Fallback: minimal .env loader to avoid hardcoding keys
-    env_path = Path(__file__).resolve().parent.parent / ".env"
-    if not env_path.exists():
-        return
-    try:
-        for line in env_path.read_text(encoding="utf-8").splitlines():
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#") or "=" not in stripped:
-                continue
-            key, value = stripped.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if key and key not in os.environ:
-                os.environ[key] = value
-    except Exception:
-        pass
+    values = read_env_file(str(Path(__file__).resolve().parent.parent / ".env"))
+    for key, value in values.items():
+        if key not in os.environ:
+            os.environ[key] = value
 
 
 def ensure_output_path(path_str: str) -> str:
@@ -57,66 +58,140 @@ def ensure_output_path(path_str: str) -> str:
     return str(path)
 
 
-import time
-import datetime
-from typing import Optional
+# Handlers serialize emission, so lines from the concurrent 1-day/7-day runs stay intact.
+log = logging.getLogger("jobinsight")
 
 
-def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str] = None) -> int:
-    """Run the analysis pipeline once."""
-    print(f"[JobInsight] Starting analysis for past {days} days...")
-    
+# Host fragments that identify which provider a base_url belongs to.
+_HOST_PROVIDER_HINTS = (
+    ("deepseek.com", "deepseek"),
+    ("dashscope.aliyuncs.com", "dashscope"),
+    ("volces.com", "doubao"),
+    ("volcengine", "doubao"),
+)
+
+
+@lru_cache(maxsize=32)
+def _parse_base_url(base_url: str) -> Tuple[str, str]:
+    """Return ``(host, hinted_provider)`` for a base_url; both empty if unset."""
+    if not base_url:
+        return "", ""
+    try:
+        host = urlparse(base_url).netloc or base_url
+    except Exception:
+        host = base_url
+    host_lower = host.lower()
+    for fragment, hinted in _HOST_PROVIDER_HINTS:
+        if fragment in host_lower:
+            return host, hinted
+    return host, ""
+
+
+_KEYWORD_KEYS = ("skills_interests", "tools_platforms")
+
+
+def _count_keywords(payload) -> int:
+    if isinstance(payload, dict):
+        return sum(len(payload.get(key) or ()) for key in _KEYWORD_KEYS)
+    if isinstance(payload, list):
+        return len(payload)
+    return 0
+
+
+def _keyword_names(payload) -> list:
+    """Non-empty keyword names from a structured payload or a legacy keyword list."""
+    if isinstance(payload, dict):
+        return [
+            name
+            for key in _KEYWORD_KEYS
+            for kw in (payload.get(key) or [])
+            if (name := str(kw.get("name", "")).strip())
+        ]
+    if isinstance(payload, list):
+        return [name for kw in payload if (name := str(kw.get("name", "")).strip())]
+    return []
+
+
+def _active_seconds(stats) -> int:
+    try:
+        return int((stats.get("dur", {}) or {}).get("active_seconds", 0) or 0)
+    except Exception:
+        return 0
+
+
+@lru_cache(maxsize=4)
+def _get_pusher(mode: str, **kwargs) -> "FeishuPusher":
+    """Reuse one pusher per configuration so App-mode tokens and open_id lookups
+    survive across the 1-day/7-day pushes and across scheduler days."""
+    from pusher.feishu_pusher import FeishuPusher
+
+    return FeishuPusher(mode=mode, **kwargs)
+
+
+@lru_cache(maxsize=4)
+def _get_rate_limiter(provider: str, base_url: str, rpm: float, burst: int) -> "TokenBucket":
+    """One requests-per-minute bucket per LLM endpoint, shared by every run in the
+    process, so the concurrent 1-day/7-day analyses stay within ``rpm`` together."""
+    from llm.retry import TokenBucket
+
+    return TokenBucket(rate=rpm / 60.0, capacity=burst)
+
+
+def load_events(config: AppConfig, days: int) -> Optional[list]:
+    """Load events for the past ``days`` from the configured source, or None if unavailable."""
     source = config.collector_source("local")
-    events = []
     if source == "activitywatch":
+        from collectors.aw_collector import ActivityWatchCollector
+
         aw_db_path = config.collector_aw_db_path("")
         collector = ActivityWatchCollector(db_path=aw_db_path or None)
         if not collector.db_path:
-            print("[Step1] ActivityWatch DB not found. Install and run ActivityWatch first, then set collector.aw_db_path.")
-            print("[Step1] Expected default locations:")
+            log.info("[Step1] ActivityWatch DB not found. Install and run ActivityWatch first, then set collector.aw_db_path.")
+            log.info("[Step1] Expected default locations:")
             for path in ActivityWatchCollector._default_db_candidates():
                 if path:
-                    print(f"[Step1]   {path}")
-            return 1
-        print(f"[Step1] Loading ActivityWatch events from: {collector.db_path}")
+                    log.info(f"[Step1]   {path}")
+            return None
+        log.info(f"[Step1] Loading ActivityWatch events from: {collector.db_path}")
         try:
-            events = collector.collect(days=days)
+            return collector.collect(days=days)
         except FileNotFoundError:
-            print("[Step1] ActivityWatch DB not found. Set collector.aw_db_path in config.json.")
-            return 1
-    else:
-        db_path = config.collector_db_path("local_events.db")
-        print(f"[Step1] Loading local events from: {db_path}")
-        store = EventStore(db_path)
-        events = store.read_events(days=days)
+            log.info("[Step1] ActivityWatch DB not found. Set collector.aw_db_path in config.json.")
+            return None
 
-    print(f"[Step1] Events loaded: {len(events)}")
-    if not events:
-        if source == "activitywatch":
-            print("[Step1] No ActivityWatch events found. Ensure ActivityWatch is running and has recent data.")
-        else:
-            print("[Step1] No events found. Run collector_service.py to collect data first.")
-        return 1
+    from storage.event_store import EventStore
 
-    compressed_data = DataCleaner.compress_data(events)
-    web_domains = len(compressed_data.get("web", {}))
-    print(f"[Step1] Domains after compression: {web_domains}")
-    chatbot_pool_seconds = int((compressed_data.get("chatbot", {}) or {}).get("pool_seconds", 0) or 0)
+    db_path = config.collector_db_path("local_events.db")
+    log.info(f"[Step1] Loading local events from: {db_path}")
+    store = EventStore(db_path)
     try:
-        chatbot_cfg = compressed_data.get("chatbot", {}) if isinstance(compressed_data, dict) else {}
-        if not isinstance(chatbot_cfg, dict):
-            chatbot_cfg = {}
-        chatbot_cfg["token_weight"] = float(config.chatbot_token_weight(0.4))
-        compressed_data["chatbot"] = chatbot_cfg
-    except Exception:
-        pass
+        return store.read_events(days=days)
+    finally:
+        store.close()
+
+
+def filter_recent_events(events: list, days: int) -> list:
+    """Narrow a preloaded event window down to the past ``days``."""
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+    return [e for e in events if e.timestamp >= cutoff]
+
+
+def prepare_chat_sessions(config: AppConfig, days: int, chat_sessions_file: Optional[str] = None) -> list:
+    """Collect (or load) the chatbot sessions for an analysis run.
+
+    The scheduler calls this once and hands the result to both the 1-day and
+    7-day runs, so they never collect and rewrite the sessions file concurrently.
+    """
+    from chat.ingest import load_chat_sessions_file
 
     chat_sessions = []
     sessions_path = str(chat_sessions_file or "").strip()
-    auto_sources = config.chatbot_sources() if config.chatbot_enabled(False) else []
-    auto_out = config.chatbot_sessions_out("") if config.chatbot_enabled(False) else ""
-    chat_days = min(days, config.chatbot_days(7)) if config.chatbot_enabled(False) else days
-    chat_max_chars = config.chatbot_max_chars(6000)
+    # Snapshot chatbot settings once; the section is consulted several times below.
+    chat_enabled = config.chatbot_enabled(False)
+    auto_sources = config.chatbot_sources() if chat_enabled else []
+    auto_out = config.chatbot_sessions_out("") if chat_enabled else ""
+    chat_days = int(min(days, config.chatbot_days(7)) if chat_enabled else days)
+    chat_max_chars = int(config.chatbot_max_chars(6000))
 
     if not sessions_path and auto_sources and auto_out:
         p = Path(auto_out)
@@ -124,72 +199,111 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
             sessions_path = auto_out
         else:
             try:
-                sessions, results = collect_chat_sessions(sources=auto_sources, days=int(chat_days), max_chars=int(chat_max_chars))
+                from chat.ingest import save_chat_sessions_jsonl
+                from chat.obsidian_export import export_sessions_per_session
+                from chat.sources import collect_chat_sessions
+
+                sessions, results = collect_chat_sessions(sources=auto_sources, days=chat_days, max_chars=chat_max_chars)
                 save_chat_sessions_jsonl(sessions, auto_out)
                 chat_sessions = [s.to_dict() for s in sessions]
-                compressed_data["chat_sessions"] = chat_sessions
-                print(f"[Chat] Sessions collected: {len(chat_sessions)}")
+                log.info(f"[Chat] Sessions collected: {len(chat_sessions)}")
                 for r in results:
                     t = str((r.source or {}).get("type", "") or "")
                     d = str((r.source or {}).get("domain", "") or "")
-                    print(f"[Chat] source={t} domain={d} sessions={len(r.sessions)} errors={len(r.errors)}")
+                    log.info(f"[Chat] source={t} domain={d} sessions={len(r.sessions)} errors={len(r.errors)}")
                     for e in r.errors[:3]:
-                        print(f"[Chat]   error: {e}")
+                        log.info(f"[Chat]   error: {e}")
 
                 if config.obsidian_enabled(False) and config.obsidian_export_mode("per-session") == "per-session":
                     vault = config.obsidian_vault_path("")
                     if vault:
                         export_sessions_per_session(sessions, vault_path=vault, folder=config.obsidian_folder("CherryStudio"))
             except Exception as e:
-                print(f"[Chat] Collect failed: {e}")
+                log.info(f"[Chat] Collect failed: {e}")
                 chat_sessions = []
 
-    if not chat_sessions and not sessions_path and config.chatbot_enabled(False):
+    if not chat_sessions and not sessions_path and chat_enabled:
         sessions_path = config.chatbot_sessions_file("")
 
     if not chat_sessions and sessions_path:
         try:
             chat_sessions = load_chat_sessions_file(sessions_path)
-            compressed_data["chat_sessions"] = chat_sessions
-            print(f"[Chat] Sessions loaded: {len(chat_sessions)}")
+            log.info(f"[Chat] Sessions loaded: {len(chat_sessions)}")
         except Exception as e:
-            print(f"[Chat] Failed to load sessions: {e}")
+            log.info(f"[Chat] Failed to load sessions: {e}")
             chat_sessions = []
 
+    return chat_sessions
+
+
+def run_analysis(
+    config: AppConfig,
+    days: int,
+    chat_sessions_file: Optional[str] = None,
+    events: Optional[list] = None,
+    chat_sessions: Optional[list] = None,
+) -> int:
+    """Run the analysis pipeline once.
+
+    ``events`` and ``chat_sessions`` may be preloaded by the caller (e.g. the
+    scheduler shares one 7-day event read and one chat collection between the
+    1-day and 7-day runs); otherwise they are loaded here.
+    """
+    from analysis.auditor import annotate_keywords
+    from cleaner.data_cleaner import DataCleaner
+    from llm.checkpoint import LLMCheckpoint
+    from llm.llm_client import create_llm_client
+    from llm.retry import RetryConfig, with_retry
+    from llm.semantic_cache import SemanticPromptCache
+
+    log.info(f"[JobInsight] Starting analysis for past {days} days...")
+    
+    source = config.collector_source("local")
+    if events is None:
+        events = load_events(config, days)
+        if events is None:
+            return 1
+
+    log.info(f"[Step1] Events loaded: {len(events)}")
+    if not events:
+        if source == "activitywatch":
+            log.info("[Step1] No ActivityWatch events found. Ensure ActivityWatch is running and has recent data.")
+        else:
+            log.info("[Step1] No events found. Run collector_service.py to collect data first.")
+        return 1
+
+    compressed_data = DataCleaner.compress_data(events)
+    web_domains = len(compressed_data.get("web", {}))
+    log.info(f"[Step1] Domains after compression: {web_domains}")
+    chatbot_pool_seconds = int((compressed_data.get("chatbot", {}) or {}).get("pool_seconds", 0) or 0)
+    try:
+        chatbot_cfg = compressed_data.get("chatbot", {}) if isinstance(compressed_data, dict) else {}
+        if not isinstance(chatbot_cfg, dict):
+            chatbot_cfg = {}
+        chatbot_cfg["token_weight"] = float(config.chatbot_token_weight(0.4))
+        compressed_data["chatbot"] = chatbot_cfg
+    except Exception:
+        pass
+
+    if chat_sessions is None:
+        chat_sessions = prepare_chat_sessions(config, days, chat_sessions_file)
+    if chat_sessions:
+        compressed_data["chat_sessions"] = chat_sessions
+
     llm_cfg = config.llm_config()
     provider = llm_cfg.get("provider", "zhipu")
     
-    # Updated: use config.get_env to support config.json fallback
-    api_key_env = resolve_api_key(provider, llm_cfg.get("api_key", ""))
-    # If resolve_api_key returns empty (not in env), try getting from config via get_env logic if applicable
-    # Actually resolve_api_key checks specific env vars. We should update resolve_api_key or call get_env first.
-    # Let's update resolve_api_key to use config.get_env if we can pass config to it, or just do it here.
-    # For now, let's assume resolve_api_key logic handles standard envs. 
-    # But user wants generic config.json fallback.
-    # Let's fetch the key name based on provider and ask config.get_env
-    
-    key_map = {
-        "zhipu": "ZHIPU_API_KEY",
-        "doubao": "VOLCANO_API_KEY",
-        "openai": "OPENAI_API_KEY",
-        "openai_compat": "OPENAI_API_KEY",
-        "deepseek": "DEEPSEEK_API_KEY",
-        "dashscope": "DASHSCOPE_API_KEY"
-    }
-    env_key = key_map.get(provider, "")
+    # Provider's primary env key first (os.environ, then config.json env_vars),
+    # then the configured key / remaining provider env vars.
+    env_key = provider_env_key(provider)
     api_key = config.get_env(env_key) if env_key else ""
     if not api_key:
-        api_key = resolve_api_key(provider, llm_cfg.get("api_key", "")) # Fallback to old logic or empty
+        api_key = resolve_api_key(provider, llm_cfg.get("api_key", ""))
 
     base_url = str(llm_cfg.get("base_url", "") or "").strip()
-    base_url_host = ""
-    if base_url:
-        try:
-            base_url_host = urlparse(base_url).netloc or base_url
-        except Exception:
-            base_url_host = base_url
+    base_url_host, hinted_provider = _parse_base_url(base_url)
 
-    print(
+    log.info(
         "[LLM] "
         + f"provider={provider} "
         + f"model={llm_cfg.get('model', '')} "
@@ -197,15 +311,9 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
         + f"env_key={env_key or '(none)'} "
         + f"key_set={'yes' if bool(api_key) else 'no'}"
     )
-    if base_url_host:
-        host_lower = base_url_host.lower()
-        provider_lower = str(provider or "").lower()
-        if "deepseek.com" in host_lower and provider_lower != "deepseek":
-            print(f"[LLM][WARNING] base_url points to deepseek but provider={provider_lower}")
-        if "dashscope.aliyuncs.com" in host_lower and provider_lower != "dashscope":
-            print(f"[LLM][WARNING] base_url points to dashscope but provider={provider_lower}")
-        if ("volces.com" in host_lower or "volcengine" in host_lower) and provider_lower != "doubao":
-            print(f"[LLM][WARNING] base_url points to doubao but provider={provider_lower}")
+    provider_lower = str(provider or "").lower()
+    if hinted_provider and hinted_provider != provider_lower:
+        log.warning(f"[LLM][WARNING] base_url points to {hinted_provider} but provider={provider_lower}")
 
     llm_client = create_llm_client(
         provider=provider,
@@ -229,51 +337,89 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
     # User requested: 1-day -> 5, 7-day -> 10.
     # We will respect this rule over config.json's keyword_max for now, or use it as a cap.
 
-    print(f"[Step1] TopN limits (days={days}): skills={skills_limit}, tools={tools_limit}, min_k={min_k}, max_k={max_k}")
+    log.info(f"[Step1] TopN limits (days={days}): skills={skills_limit}, tools={tools_limit}, min_k={min_k}, max_k={max_k}")
 
-    try:
-        self_consistency_runs = int(llm_cfg.get("self_consistency_runs", 1) or 1)
-        runs = []
-        llm_meta = {"used_llm": False, "fallback_used": True, "http_status": None, "error": ""}
-        if self_consistency_runs <= 1:
-            keywords, llm_meta = llm_client.extract_keywords(
-                compressed_data,
-                min_k=min_k,
-                max_k=max_k,
-                skills_limit=skills_limit,
-                tools_limit=tools_limit,
-                return_meta=True,
+    extract_kwargs = {
+        "min_k": min_k,
+        "max_k": max_k,
+        "skills_limit": skills_limit,
+        "tools_limit": tools_limit,
+        "return_meta": True,
+    }
+    self_consistency_runs = int(llm_cfg.get("self_consistency_runs", 1) or 1)
+    retry_cfg = RetryConfig.from_llm_config(llm_cfg)
+    # Requests-per-minute gate; the burst covers one fan-out so it is not serialized.
+    rate_limiter = _get_rate_limiter(
+        str(provider or "").lower(),
+        base_url,
+        float(llm_cfg.get("rpm", 60) or 0),
+        max(1, self_consistency_runs) + 1,
+    )
+
+    # Successful results are checkpointed by input hash so reruns over the same
+    # data (e.g. after a later step failed) skip the LLM round-trip.
+    checkpoint = LLMCheckpoint.from_llm_config(llm_cfg, config.resolve_path)
+    # Opt-in: near-duplicate activity windows reuse a recent result as well.
+    semantic_cache = SemanticPromptCache.from_llm_config(llm_cfg, config.resolve_path)
+    model_id = (provider, llm_cfg.get("model", ""), base_url)
+
+    def _checkpointed(kind: str, params, data, fn):
+        def _miss():
+            payload, meta, score = semantic_cache.call(checkpoint.make_key(kind, model_id, params), data, fn)
+            if score is not None:
+                log.info(f"[LLM] Semantic cache hit ({kind}, similarity={score:.3f}), skipping LLM call")
+            return payload, meta
+
+        payload, meta, hit = checkpoint.call(checkpoint.make_key(kind, model_id, [params, data]), _miss)
+        if hit:
+            log.info(f"[LLM] Checkpoint hit ({kind}), skipping LLM call")
+        return payload, meta
+
+    def _extract_keywords():
+        return with_retry(
+            lambda: llm_client.extract_keywords(compressed_data, **extract_kwargs),
+            retry_cfg,
+            rate_limiter,
+        )
+
+    runs = []
+    llm_meta = {"used_llm": False, "fallback_used": True, "http_status": None, "error": ""}
+    chatbot_future = None
+    # LLM calls are network bound and share no state: fan the self-consistency
+    # runs out concurrently and overlap the chatbot extraction with them.
+    with ThreadPoolExecutor(max_workers=max(1, self_consistency_runs) + 1, thread_name_prefix="llm") as llm_pool:
+        if chat_sessions:
+            chatbot_future = llm_pool.submit(
+                _checkpointed,
+                "chatbot",
+                [skills_limit, min(3, tools_limit)],
+                chat_sessions,
+                lambda: with_retry(
+                    lambda: llm_client.extract_chatbot_keywords(
+                        chat_sessions=chat_sessions,
+                        skills_limit=skills_limit,
+                        tools_limit=min(3, tools_limit),
+                        return_meta=True,
+                    ),
+                    retry_cfg,
+                    rate_limiter,
+                ),
             )
-        else:
-            keywords = None
-            for _ in range(self_consistency_runs):
-                run_keywords, run_meta = llm_client.extract_keywords(
-                    compressed_data,
-                    min_k=min_k,
-                    max_k=max_k,
-                    skills_limit=skills_limit,
-                    tools_limit=tools_limit,
-                    return_meta=True,
-                )
-                runs.append(run_keywords)
-                llm_meta = run_meta
-            # Use the last run as primary, but compute consistency across runs
-            keywords = runs[-1] if runs else None
-    except Exception as e:
-        print(f"[Step1] LLM call failed: {e}")
-        # In scheduler mode, we might not want to raise, just log and return
-        return 1
-    def _count_keywords(payload) -> int:
-        if isinstance(payload, dict):
-            total = 0
-            for key in ("skills_interests", "tools_platforms"):
-                total += len(payload.get(key, []) or [])
-            return total
-        if isinstance(payload, list):
-            return len(payload)
-        return 0
+        try:
+            if self_consistency_runs <= 1:
+                keywords, llm_meta = _checkpointed("keywords", extract_kwargs, compressed_data, _extract_keywords)
+            else:
+                results = list(llm_pool.map(lambda _: _extract_keywords(), range(self_consistency_runs)))
+                runs = [run_keywords for run_keywords, _ in results]
+                llm_meta = results[-1][1] if results else llm_meta
+                # Use the last run as primary, but compute consistency across runs
+                keywords = runs[-1] if runs else None
+        except Exception as e:
+            log.info(f"[Step1] LLM call failed: {e}")
+            # In scheduler mode, we might not want to raise, just log and return
+            return 1
 
-    print(f"[Step1] Keywords extracted: {_count_keywords(keywords)}")
+    log.info(f"[Step1] Keywords extracted: {_count_keywords(keywords)}")
 
     chatbot_meta = None
     if chat_sessions:
@@ -295,29 +441,20 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
                         est_pool = per_session_pool * session_count
                         effective_chatbot_pool_seconds = min(int(est_pool), max_active_total)
 
-            chatbot_keywords, chatbot_meta = llm_client.extract_chatbot_keywords(
-                chat_sessions=chat_sessions,
-                skills_limit=skills_limit,
-                tools_limit=min(3, tools_limit),
-                return_meta=True,
-            )
+            chatbot_keywords, chatbot_meta = chatbot_future.result()
             if isinstance(chatbot_keywords, dict) and not (chatbot_keywords.get("tools_platforms") or []):
                 domains = (compressed_data.get("chatbot", {}) or {}).get("domains", {}) if isinstance(compressed_data, dict) else {}
                 domain_items = []
                 if isinstance(domains, dict) and domains:
-                    pairs = []
-                    for d, stats in domains.items():
-                        try:
-                            sec = int((stats.get("dur", {}) or {}).get("active_seconds", 0) or 0)
-                        except Exception:
-                            sec = 0
-                        d = str(d or "").strip()
-                        if d and sec > 0:
-                            pairs.append((d, sec))
-                    pairs.sort(key=lambda x: (-x[1], x[0]))
-                    max_sec = max([s for _, s in pairs] or [1])
-                    for d, sec in pairs[: min(5, len(pairs))]:
-                        domain_items.append({"name": d, "weight": float(sec) / float(max_sec) if max_sec else 0.5})
+                    candidates = ((str(d or "").strip(), _active_seconds(stats)) for d, stats in domains.items())
+                    # Only the top 5 are needed: O(n log 5) instead of a full sort
+                    top = heapq.nsmallest(
+                        5,
+                        ((d, sec) for d, sec in candidates if d and sec > 0),
+                        key=lambda x: (-x[1], x[0]),
+                    )
+                    max_sec = top[0][1] if top else 1
+                    domain_items = [{"name": d, "weight": float(sec) / float(max_sec)} for d, sec in top]
                 chatbot_keywords["tools_platforms"] = domain_items
             non_chat_total = max(0, int(active_total) - int(effective_chatbot_pool_seconds))
 
@@ -327,35 +464,20 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
             if not isinstance(base_payload, dict):
                 base_payload = {"skills_interests": [], "tools_platforms": []}
 
+            from chat.merge import merge_keyword_payloads
+
             keywords = merge_keyword_payloads(
                 base_payload=base_payload,
                 chatbot_payload=chatbot_keywords,
                 non_chat_total_seconds=non_chat_total,
                 chatbot_pool_seconds=effective_chatbot_pool_seconds,
             )
-            print(f"[Chat] Keywords merged: {_count_keywords(keywords)}")
+            log.info(f"[Chat] Keywords merged: {_count_keywords(keywords)}")
         except Exception as e:
-            print(f"[Chat] Merge failed: {e}")
+            log.info(f"[Chat] Merge failed: {e}")
 
     # Annotate keywords with evidence/scores/level (2A)
-    consistency_runs = []
-    if isinstance(runs, list) and runs:
-        for item in runs:
-            if isinstance(item, dict):
-                names = []
-                for key in ("skills_interests", "tools_platforms"):
-                    for kw in item.get(key, []) or []:
-                        name = str(kw.get("name", "")).strip()
-                        if name:
-                            names.append(name)
-                consistency_runs.append(names)
-            elif isinstance(item, list):
-                names = []
-                for kw in item:
-                    name = str(kw.get("name", "")).strip()
-                    if name:
-                        names.append(name)
-                consistency_runs.append(names)
+    consistency_runs = [_keyword_names(item) for item in (runs or []) if isinstance(item, (dict, list))]
 
     keywords = annotate_keywords(keywords, compressed_data, consistency_runs=consistency_runs)
 
@@ -365,9 +487,25 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
     name_part, ext_part = os.path.splitext(base_wc_file)
     wordcloud_file = ensure_output_path(f"{name_part}_{days}d{ext_part}")
 
-    wc_generator = WordCloudGenerator()
-    wc_generator.generate(keywords, wordcloud_file)
-    print(f"[Step1] Wordcloud generated: {wordcloud_file}")
+    # Skip rewriting the word cloud HTML when the keyword payload is identical to last time
+    wc_fingerprint = hashlib.blake2b(
+        json.dumps(keywords, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"),
+        digest_size=8,
+    ).hexdigest()
+    sha_path = Path(wordcloud_file + ".sha")
+    try:
+        wc_unchanged = Path(wordcloud_file).exists() and sha_path.read_text(encoding="utf-8").strip() == wc_fingerprint
+    except OSError:
+        wc_unchanged = False
+    if wc_unchanged:
+        log.info(f"[Step1] Wordcloud unchanged (cache hit): {wordcloud_file}")
+    else:
+        from visualization.wordcloud import WordCloudGenerator
+
+        wc_generator = WordCloudGenerator()
+        wc_generator.generate(keywords, wordcloud_file)
+        sha_path.write_text(wc_fingerprint, encoding="utf-8")
+        log.info(f"[Step1] Wordcloud generated: {wordcloud_file}")
 
     feishu_account, webhook_url = config.feishu_webhook()
     feishu_cfg = config.section("feishu")
@@ -381,11 +519,11 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
         push_on_llm_fallback=push_on_llm_fallback,
     )
     if not should_push:
-        print(f"[Step1] Feishu push skipped: {skip_reason}")
+        log.info(f"[Step1] Feishu push skipped: {skip_reason}")
     
     # 优先使用配置的webhook
     if webhook_url and should_push:
-        pusher = FeishuPusher(mode="bot", webhook_url=webhook_url)
+        pusher = _get_pusher("bot", webhook_url=webhook_url)
         pusher.push_keywords(
             keywords,
             title_suffix=f" (Past {days} Days){title_fallback_suffix}",
@@ -393,39 +531,64 @@ def run_analysis(config: AppConfig, days: int, chat_sessions_file: Optional[str]
             tools_limit=tools_limit,
         )
         if feishu_account:
-            print(f"[Step1] Feishu push sent (account: {feishu_account})")
+            log.info(f"[Step1] Feishu push sent (account: {feishu_account})")
         else:
-            print("[Step1] Feishu push sent via Webhook")
+            log.info("[Step1] Feishu push sent via Webhook")
     else:
         # 尝试使用App模式
-        app_id = config.get_env("FEISHU_APP_ID")
-        if app_id and should_push:
-            email = config.get_env("FEISHU_EMAIL")
-            open_id = config.get_env("FEISHU_OPEN_ID")
-            mobile = config.get_env("FEISHU_MOBILES")
-            app_secret = config.get_env("FEISHU_APP_SECRET")
-            
-            if not email and not open_id and not mobile:
-                 print('[Step1] FEISHU_APP_ID found but no target user (EMAIL/OPEN_ID/MOBILES). Skipping push.')
+        app_env = config.feishu_app_env()
+        if app_env.app_id and should_push:
+            if not app_env.has_target:
+                 log.info('[Step1] FEISHU_APP_ID found but no target user (EMAIL/OPEN_ID/MOBILES). Skipping push.')
             else:
                 try:
-                    pusher = FeishuPusher(mode="app", app_id=app_id, app_secret=app_secret, email=email, user_id=open_id, mobile=mobile)
+                    pusher = _get_pusher(
+                        "app",
+                        app_id=app_env.app_id,
+                        app_secret=app_env.app_secret,
+                        email=app_env.email,
+                        user_id=app_env.open_id,
+                        mobile=app_env.mobiles,
+                    )
                     pusher.push_keywords(
                         keywords,
                         title_suffix=f" (Past {days} Days){title_fallback_suffix}",
                         skills_limit=skills_limit,
                         tools_limit=tools_limit,
                     )
-                    print(f'[Step1] Feishu push sent via App (Target: {email or mobile or open_id})')
+                    log.info(f'[Step1] Feishu push sent via App (Target: {app_env.target})')
                 except Exception as e:
-                    print(f"[Step1] Feishu App push failed: {e}")
+                    log.info(f"[Step1] Feishu App push failed: {e}")
         else:
             if should_push:
-                print("[Step1] Feishu not configured (neither Webhook nor App ID found), skipping push")
+                log.info("[Step1] Feishu not configured (neither Webhook nor App ID found), skipping push")
 
     return 0
 
 
+_CFG_CACHE: Optional[Tuple[float, AppConfig]] = None
+
+
+def _load_config_cached(config_path: Path) -> AppConfig:
+    """Re-parse config.json only when its mtime changed since the last load."""
+    global _CFG_CACHE
+    mtime = os.stat(config_path).st_mtime
+    if _CFG_CACHE is not None and _CFG_CACHE[0] == mtime:
+        return _CFG_CACHE[1]
+    config = AppConfig.from_file(str(config_path))
+    _CFG_CACHE = (mtime, config)
+    return config
+
+
+def next_run_at(target_time: str, now: datetime.datetime) -> datetime.datetime:
+    """Return the next datetime matching ``target_time`` ("HH:MM") strictly after ``now``."""
+    hour, minute = (int(part) for part in str(target_time).strip().split(":", 1))
+    next_run = datetime.datetime.combine(now.date(), datetime.time(hour, minute))
+    if next_run <= now:
+        next_run += datetime.timedelta(days=1)
+    return next_run
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="JobInsight Step 1 MVP")
     parser.add_argument("--days", type=int, default=None, help="Days of data to analyze")
@@ -434,10 +597,11 @@ def main() -> int:
     parser.add_argument("-test", "--test", action="store_true", help="Run immediately (bypass scheduler)")
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     load_env()
 
     config_path = resolve_config_path(args.config)
-    config = AppConfig.from_file(str(config_path))
+    config = _load_config_cached(config_path)
     
     schedule_cfg = config.schedule_config()
     enabled = schedule_cfg.get("enabled", False)
@@ -451,48 +615,61 @@ def main() -> int:
         # Run scheduler
         target_time = schedule_cfg.get("time", "09:00")
         days = schedule_cfg.get("days_to_analyze", 1) 
-        print(f"[JobInsight] Scheduler started. Will run daily at {target_time} (Dual Mode: 1-Day & 7-Day analysis).")
-        print(f"[JobInsight] Current Time (Container): {datetime.datetime.now().strftime('%H:%M:%S')}")
-        print("[JobInsight] Press Ctrl+C to exit.")
+        log.info(f"[JobInsight] Scheduler started. Will run daily at {target_time} (Dual Mode: 1-Day & 7-Day analysis).")
+        log.info(f"[JobInsight] Current Time (Container): {datetime.datetime.now().strftime('%H:%M:%S')}")
+        log.info("[JobInsight] Press Ctrl+C to exit.")
         
         while True:
             try:
-                # Reload config to support hot-reloading without restart
-                # (Re-parsing config.json every loop is cheap and useful)
-                config = AppConfig.from_file(str(config_path))
-                schedule_cfg = config.schedule_config()
-                target_time = schedule_cfg.get("time", "09:00")
-                days = schedule_cfg.get("days_to_analyze", 1)
-                
                 now = datetime.datetime.now()
-                current_time = now.strftime("%H:%M")
-                
-                # Debug log every hour to show aliveness (optional)
-                if now.minute == 0 and now.second < 30:
-                     print(f"[JobInsight] Heartbeat: {current_time} (Target: {target_time})")
-
-                if current_time == target_time:
-                    print(f"[JobInsight] Triggering scheduled analysis at {current_time}...")
-                    
-                    # User Request: "give 1 day / 7 days push at the same time"
-                    # Run 1-day analysis
-                    print("[JobInsight] Running 1-day analysis...")
-                    run_analysis(config, 1)
-                    
-                    # Run 7-day analysis
-                    print("[JobInsight] Running 7-day analysis...")
-                    run_analysis(config, 7)
-                    
-                    # Sleep for 61 seconds to avoid double triggering
-                    time.sleep(61)
-                else:
-                    # Sleep for a bit
-                    time.sleep(30)
+                next_run = next_run_at(target_time, now)
+                wait_seconds = (next_run - now).total_seconds()
+                log.info(f"[JobInsight] Next run at {next_run.strftime('%Y-%m-%d %H:%M')} (in {int(wait_seconds)}s)")
+                time.sleep(max(0.0, wait_seconds))
+
+                # Reload config after waking (only re-parsed if the file changed)
+                config = _load_config_cached(config_path)
+                schedule_cfg = config.schedule_config()
+                new_target = schedule_cfg.get("time", "09:00")
+                if new_target != target_time:
+                    log.info(f"[JobInsight] Schedule changed: {target_time} -> {new_target}")
+                    target_time = new_target
+                    continue
+
+                log.info(f"[JobInsight] Triggering scheduled analysis at {datetime.datetime.now().strftime('%H:%M')}...")
+
+                # User Request: "give 1 day / 7 days push at the same time"
+                # Both runs are I/O bound (SQLite + LLM HTTP), so overlap them.
+                # AppConfig is read-only during a run, so both share the cached instance.
+                # Events are read once for the 7-day window; the 1-day set is a subset.
+                events_7d = load_events(config, 7)
+                if events_7d is None:
+                    continue
+                events_by_days = {1: filter_recent_events(events_7d, 1), 7: events_7d}
+                # Chat sessions are collected once, up front, for the first run that has
+                # events (the sequential order used to be 1-day, then 7-day reusing its
+                # sessions file); collecting inside both threads raced on that file.
+                chat_days = 1 if events_by_days[1] else 7
+                chat_sessions = prepare_chat_sessions(config, chat_days) if events_7d else []
+                log.info("[JobInsight] Running 1-day and 7-day analyses...")
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix="analysis") as executor:
+                    futures = {
+                        executor.submit(
+                            run_analysis, config, d, events=events_by_days[d], chat_sessions=chat_sessions
+                        ): d
+                        for d in (1, 7)
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            rc = future.result()
+                            log.info(f"[JobInsight] {futures[future]}-day analysis finished (rc={rc})")
+                        except Exception as e:
+                            log.info(f"[JobInsight] {futures[future]}-day analysis failed: {e}")
             except KeyboardInterrupt:
-                print("\n[JobInsight] Scheduler stopped.")
+                log.info("\n[JobInsight] Scheduler stopped.")
                 break
             except Exception as e:
-                print(f"[JobInsight] Scheduler error: {e}")
+                log.info(f"[JobInsight] Scheduler error: {e}")
                 time.sleep(60)
         return 0
 
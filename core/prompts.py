@@ -1,5 +1,152 @@
 import json
-from typing import Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = [
+    "KEYWORD_EXTRACTION_PREAMBLE",
+    "build_keyword_extraction_prompt",
+    "build_chatbot_keyword_prompt",
+]
+
+_DATA_PREVIEW_CHARS = 8000
+
+
+def _json_preview(data: Any, limit: int = _DATA_PREVIEW_CHARS) -> str:
+    """First ``limit`` characters of ``data`` as indented JSON.
+
+    Uses orjson when available; its UTF-8 output is cut at ``4 * limit`` bytes
+    (always enough for ``limit`` characters) so the full text is never decoded.
+    The text is not byte-identical to the stdlib fallback: orjson writes floats
+    as ``0.00001`` / ``1e17`` (json: ``1e-05`` / ``1e+17``) and NaN/Infinity as
+    ``null``. So the prompt, and any provider-side prompt-cache prefix, depends
+    on whether orjson (listed in requirements.txt) is installed.
+    """
+    if orjson is not None:
+        try:
+            raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            return raw[: 4 * limit].decode("utf-8", errors="ignore")[:limit]
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2)[:limit]
+
+
+# Titles the prompt tells the LLM to ignore anyway; dropping them up front saves
+# tokens and leaves more of the preview budget for real signal.
+_NOISE_TITLE_RE = re.compile(
+    r"^(?:\S+\.exe|exe|msedge|chrome|cmd|powershell|home|search|new tab|untitled|loading|\d+)$",
+    re.IGNORECASE,
+)
+
+
+def _is_noise_title(title: Any) -> bool:
+    return not isinstance(title, str) or not title.strip() or _NOISE_TITLE_RE.match(title.strip()) is not None
+
+
+def _prune_domains(domains: Any) -> Any:
+    if not isinstance(domains, dict):
+        return domains
+    pruned = {}
+    for domain, stats in domains.items():
+        if isinstance(stats, dict):
+            stats = dict(stats)
+            if isinstance(stats.get("title_samples"), list):
+                stats["title_samples"] = [t for t in stats["title_samples"] if not _is_noise_title(t)]
+            if isinstance(stats.get("title_freq"), dict):
+                stats["title_freq"] = {t: n for t, n in stats["title_freq"].items() if not _is_noise_title(t)}
+        pruned[domain] = stats
+    return pruned
+
+
+def _prune_noise(compressed_data: Any) -> Any:
+    """Copy of ``compressed_data`` with noise titles removed (the input is not mutated)."""
+    if not isinstance(compressed_data, dict):
+        return compressed_data
+    data = dict(compressed_data)
+    if "web" in data:
+        data["web"] = _prune_domains(data["web"])
+    chatbot = data.get("chatbot")
+    if isinstance(chatbot, dict) and "domains" in chatbot:
+        data["chatbot"] = {**chatbot, "domains": _prune_domains(chatbot["domains"])}
+    non_web = data.get("non_web_samples")
+    if isinstance(non_web, dict) and isinstance(non_web.get("window"), list):
+        data["non_web_samples"] = {
+            **non_web,
+            "window": [
+                {**app, "titles": [t for t in app["titles"] if not _is_noise_title(t)]}
+                if isinstance(app, dict) and isinstance(app.get("titles"), list)
+                else app
+                for app in non_web["window"]
+            ],
+        }
+    return data
+
+
+# Static instructions for keyword extraction. Everything that varies per call
+# (limits, DATA) is appended after it, so the prompt prefix stays byte-identical
+# across calls and can be served from provider-side prompt caches.
+KEYWORD_EXTRACTION_PREAMBLE = (
+    "You are an expert career counselor. Analyze the provided user activity data to identify professional skills and interests.\n"
+    "The data is grouped into 'web' (browser history) and 'apps' (active applications).\n\n"
+    "**Goal**: Extract high-quality insights, STRICTLY separating 'Content/Skills' (The What) from 'Tools/Platforms' (The Via).\n\n"
+    "**Inference Logic (Contextual Analysis)**:\n"
+    "- **For Apps**: The 'App Name' is the Container/Tool. The 'Titles' are High-Value Context Tags (logic/code/docs).\n"
+    "  - **Filtered Data**: The input titles have already been filtered to exclude low-value files (configs, logs, readmes). Trust the list.\n"
+    "  - **Inference**: Use the remaining titles to infer the specific skill. If an App has no titles, it was likely used for generic/low-value tasks; record it as a Tool but infer no Skill from it.\n"
+    "  - **AI Context**: If the App is an AI IDE (e.g., Trae, Cursor) and has code files, infer 'AI-Assisted Development' + the language skill.\n"
+    "  - Example: App='Trae AI', Titles=['main.py'] -> Skill='Python Development', Tool='Trae AI'.\n"
+    "- **For Web**: The 'Domain' is the Platform/Tool. The 'Titles' reveal the Interest/Skill.\n"
+    "  - Example: Domain='github.com', Title='react-repo' -> Skill='React', Tool='GitHub'.\n\n"
+    "**Categories**:\n"
+    "1. **Skills & Interests (The What)**: Technical concepts, programming languages, fields of study, or job roles.\n"
+    "   - EXAMPLES: 'Python', 'Data Analysis', 'Workflow Automation', 'Machine Learning', 'Product Management'\n"
+    "2. **Tools & Platforms (The Via)**: Software applications, websites, browsers, or services used to perform the activity.\n"
+    "   - EXAMPLES: 'Visual Studio Code', 'GitHub', 'BOSS直聘', '知乎', 'n8n.io', 'Chrome', 'Feishu', 'Trae AI'\n\n"
+    "**Rules**:\n"
+    "1. **Ignore Noise**: Strictly ignore system process names (e.g., 'exe', 'msedge', 'cmd') and generic terms (e.g., 'Home', 'Search').\n"
+    "2. **Container Constraint**: If a Tool is a generic container (Browser/IDE/Terminal), list it ONLY under 'Tools & Platforms', NEVER under 'Skills & Interests'.\n"
+    "3. **Merge Concepts**: If you see 'Python 3.9' and 'Python Script', output 'Python'.\n"
+    "4. **No Overlap**: A keyword cannot exist in both categories. Decide which one fits best.\n\n"
+    "**Output Requirement**:\n"
+    "- Return JSON only with this structure:\n"
+    "  {\n"
+    "    \"skills_interests\": [{\"name\": str, \"weight\": float}],\n"
+    "    \"tools_platforms\": [{\"name\": str, \"weight\": float}]\n"
+    "  }\n"
+    "- Weights (0.0-1.0) should reflect relevance/duration.\n"
+)
+
+# Full prompt templates, built once at import; only the holes are filled per call.
+_KEYWORD_PROMPT_TEMPLATE = (
+    KEYWORD_EXTRACTION_PREAMBLE.replace("{", "{{").replace("}", "}}")
+    + "- Limits: Skills & Interests Top {skills_limit}; Tools & Platforms Top {tools_limit}.\n\n"
+    + "DATA:\n{data_preview}"
+)
+
+_CHATBOT_PROMPT_TEMPLATE = (
+    "You are an expert analyst. Extract professional skills and interests from chat session summaries.\n\n"
+    "**Goal**: Identify the user's real work/learning topics reflected in the sessions.\n"
+    "- Treat the chatbot domain as a Tool/Platform (The Via).\n"
+    "- Extract Skills/Interests (The What) from the session text only.\n\n"
+    "**Rules**:\n"
+    "1. Output MUST be JSON only.\n"
+    "2. Each skill MUST include a short evidence_quote that appears verbatim in the session text.\n"
+    "3. Avoid generic words (e.g., 'AI', 'help', 'question'). Prefer specific technologies/tasks/issues.\n"
+    "4. No overlap between Skills and Tools.\n\n"
+    "**Output Requirement**:\n"
+    "  {{\n"
+    "    \"skills_interests\": [{{\"name\": str, \"weight\": float, \"evidence_quote\": str, \"source_domain\": str}}],\n"
+    "    \"tools_platforms\": [{{\"name\": str, \"weight\": float}}]\n"
+    "  }}\n"
+    "- Weights (0.0-1.0) reflect relative importance within chatbot sessions only.\n"
+    "- Limits: Skills Top {skills_limit}; Tools Top {tools_limit}.\n\n"
+    "DATA (one block per session, headed by '### SESSION <n> [<domain>]'):\n{data_preview}"
+)
+
 
 def build_keyword_extraction_prompt(
     compressed_data: Dict,
@@ -11,67 +158,46 @@ def build_keyword_extraction_prompt(
     """
     Constructs the prompt for extracting keywords from user activity data.
     """
-    data_preview = json.dumps(compressed_data, ensure_ascii=False, indent=2)[:8000]
+    data_preview = _json_preview(_prune_noise(compressed_data))
     if skills_limit is None:
         skills_limit = max_k // 2
     if tools_limit is None:
         tools_limit = max_k // 2
-    return (
-        "You are an expert career counselor. Analyze the provided user activity data to identify professional skills and interests.\n"
-        "The data is grouped into 'web' (browser history) and 'apps' (active applications).\n\n"
-        "**Goal**: Extract high-quality insights, STRICTLY separating 'Content/Skills' (The What) from 'Tools/Platforms' (The Via).\n\n"
-        "**Inference Logic (Contextual Analysis)**:\n"
-        "- **For Apps**: The 'App Name' is the Container/Tool. The 'Titles' are High-Value Context Tags (logic/code/docs).\n"
-        "  - **Filtered Data**: The input titles have already been filtered to exclude low-value files (configs, logs, readmes). Trust the list.\n"
-        "  - **Inference**: Use the remaining titles to infer the specific skill. If an App has no titles, it was likely used for generic/low-value tasks; record it as a Tool but infer no Skill from it.\n"
-        "  - **AI Context**: If the App is an AI IDE (e.g., Trae, Cursor) and has code files, infer 'AI-Assisted Development' + the language skill.\n"
-        "  - Example: App='Trae AI', Titles=['main.py'] -> Skill='Python Development', Tool='Trae AI'.\n"
-        "- **For Web**: The 'Domain' is the Platform/Tool. The 'Titles' reveal the Interest/Skill.\n"
-        "  - Example: Domain='github.com', Title='react-repo' -> Skill='React', Tool='GitHub'.\n\n"
-        "**Categories**:\n"
-        "1. **Skills & Interests (The What)**: Technical concepts, programming languages, fields of study, or job roles.\n"
-        "   - EXAMPLES: 'Python', 'Data Analysis', 'Workflow Automation', 'Machine Learning', 'Product Management'\n"
-        "2. **Tools & Platforms (The Via)**: Software applications, websites, browsers, or services used to perform the activity.\n"
-        "   - EXAMPLES: 'Visual Studio Code', 'GitHub', 'BOSS直聘', '知乎', 'n8n.io', 'Chrome', 'Feishu', 'Trae AI'\n\n"
-        "**Rules**:\n"
-        "1. **Ignore Noise**: Strictly ignore system process names (e.g., 'exe', 'msedge', 'cmd') and generic terms (e.g., 'Home', 'Search').\n"
-        "2. **Container Constraint**: If a Tool is a generic container (Browser/IDE/Terminal), list it ONLY under 'Tools & Platforms', NEVER under 'Skills & Interests'.\n"
-        "3. **Merge Concepts**: If you see 'Python 3.9' and 'Python Script', output 'Python'.\n"
-        "4. **No Overlap**: A keyword cannot exist in both categories. Decide which one fits best.\n\n"
-        f"**Output Requirement**:\n"
-        f"- Return JSON only with this structure:\n"
-        "  {\n"
-        "    \"skills_interests\": [{\"name\": str, \"weight\": float}],\n"
-        "    \"tools_platforms\": [{\"name\": str, \"weight\": float}]\n"
-        "  }\n"
-        "- Weights (0.0-1.0) should reflect relevance/duration.\n"
-        f"- Limits: Skills & Interests Top {skills_limit}; Tools & Platforms Top {tools_limit}.\n\n"
-        f"DATA:\n{data_preview}"
+    return _KEYWORD_PROMPT_TEMPLATE.format(
+        skills_limit=skills_limit,
+        tools_limit=tools_limit,
+        data_preview=data_preview,
     )
 
 
+def _marshal_sessions(chat_sessions: List[Dict], limit: int = _DATA_PREVIEW_CHARS) -> str:
+    # Pack every session into one prompt as plain-text blocks. Indented JSON
+    # spent the budget on ids/paths/timestamps and cut off later sessions
+    # mid-object; only the domain and the text matter to the model.
+    blocks = []
+    used = 0
+    for i, sess in enumerate(chat_sessions, 1):
+        if not isinstance(sess, dict):
+            continue
+        text = str(sess.get("compressed_text", "") or "").strip()
+        if not text:
+            continue
+        block = f"### SESSION {i} [{str(sess.get('domain', '') or '').strip()}]\n{text}\n"
+        blocks.append(block)
+        used += len(block)
+        if used >= limit:
+            break
+    return "\n".join(blocks)[:limit]
+
+
 def build_chatbot_keyword_prompt(
     chat_sessions: List[Dict],
     skills_limit: int = 10,
     tools_limit: int = 3,
 ) -> str:
-    data_preview = json.dumps(chat_sessions, ensure_ascii=False, indent=2)[:8000]
-    return (
-        "You are an expert analyst. Extract professional skills and interests from chat session summaries.\n\n"
-        "**Goal**: Identify the user's real work/learning topics reflected in the sessions.\n"
-        "- Treat the chatbot domain as a Tool/Platform (The Via).\n"
-        "- Extract Skills/Interests (The What) from the session text only.\n\n"
-        "**Rules**:\n"
-        "1. Output MUST be JSON only.\n"
-        "2. Each skill MUST include a short evidence_quote that appears verbatim in compressed_text.\n"
-        "3. Avoid generic words (e.g., 'AI', 'help', 'question'). Prefer specific technologies/tasks/issues.\n"
-        "4. No overlap between Skills and Tools.\n\n"
-        "**Output Requirement**:\n"
-        "  {\n"
-        "    \"skills_interests\": [{\"name\": str, \"weight\": float, \"evidence_quote\": str, \"source_domain\": str}],\n"
-        "    \"tools_platforms\": [{\"name\": str, \"weight\": float}]\n"
-        "  }\n"
-        "- Weights (0.0-1.0) reflect relative importance within chatbot sessions only.\n"
-        f"- Limits: Skills Top {skills_limit}; Tools Top {tools_limit}.\n\n"
-        f"DATA:\n{data_preview}"
+    data_preview = _marshal_sessions(chat_sessions)
+    return _CHATBOT_PROMPT_TEMPLATE.format(
+        skills_limit=skills_limit,
+        tools_limit=tools_limit,
+        data_preview=data_preview,
     )
@@ -1,17 +1,89 @@
+import functools
+import hashlib
+import heapq
 import json
 import os
+import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Any, List, Dict, Optional, Union
 from datetime import datetime
 
 import requests
-
-# 自动加载 .env 文件
-_env_path = Path(__file__).parent.parent.parent / ".env"
-if _env_path.exists():
-    from dotenv import load_dotenv
-    load_dotenv(_env_path, override=True)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_env() -> None:
+    """首次创建推送器时加载仓库根目录的 .env（仅一次）"""
+    env_path = Path(__file__).resolve().parents[2] / ".env"
+    if env_path.exists():
+        from dotenv import load_dotenv
+        load_dotenv(env_path, override=True)
+
+
+_SESSION: Optional[Any] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _new_session() -> Any:
+    """优先使用 httpx + HTTP/2（token、用户查找、发消息复用同一条连接），否则退回 requests"""
+    if httpx is not None:
+        try:
+            transport = httpx.HTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+            return httpx.Client(transport=transport, follow_redirects=True)
+        except ImportError:
+            # http2=True 需要额外安装 h2
+            pass
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.3)),
+    )
+    return session
+
+
+def _get_session() -> Any:
+    """进程内共享的 HTTP 客户端，复用到飞书的 TCP/TLS 连接"""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _new_session()
+    return _SESSION
+
+
+def _read_json_cache(path: Path) -> Dict:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _write_json_cache(path: Path, data: Dict) -> None:
+    """原子写入仅当前用户可读的缓存文件（失败时静默忽略）"""
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".tmp", dir=str(path.parent))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except Exception:
+        pass
 
 
 class FeishuPusher:
@@ -22,6 +94,10 @@ class FeishuPusher:
     TOKEN_URL = f"{FEISHU_API_BASE}/auth/v3/tenant_access_token/internal"
     USER_INFO_URL = f"{FEISHU_API_BASE}/user/v1/me"
     MESSAGE_URL = f"{FEISHU_API_BASE}/im/v1/messages"
+    # tenant_access_token 跨进程缓存（按 app_id 存放）
+    TOKEN_CACHE_PATH = Path.home() / ".myjob" / "feishu_token.json"
+    # email/mobile -> open_id 的持久化映射，省去每次启动的 batch_get_id 调用
+    USER_CACHE_PATH = Path.home() / ".myjob" / "feishu_user.json"
 
     def __init__(self, mode: str = "bot", webhook_url: str = None, app_id: str = None, app_secret: str = None, user_id: str = None, email: str = None, mobile: str = None, timeout: int = 20):
         """
@@ -37,6 +113,7 @@ class FeishuPusher:
             mobile: 接收消息的用户手机号（mode="app"时选填，用于查找Open ID）
             timeout: 请求超时时间（秒）
         """
+        _load_env()
         self.mode = mode
         self.timeout = timeout
 
@@ -52,6 +129,7 @@ class FeishuPusher:
         
         self._tenant_access_token: Optional[str] = None
         self._token_expires_at: float = 0
+        self._user_id_resolved = False
 
     def set_user_id(self, user_id: str) -> None:
         """动态设置用户ID"""
@@ -66,12 +144,17 @@ class FeishuPusher:
         if not self.app_id or not self.app_secret:
             raise ValueError("APP_ID 和 APP_SECRET 未配置")
 
+        cached = self._load_cached_token()
+        if cached:
+            self._tenant_access_token, self._token_expires_at = cached
+            return self._tenant_access_token
+
         payload = {
             "app_id": self.app_id,
             "app_secret": self.app_secret
         }
 
-        resp = requests.post(self.TOKEN_URL, json=payload, timeout=self.timeout)
+        resp = _get_session().post(self.TOKEN_URL, json=payload, timeout=self.timeout)
         resp.raise_for_status()
 
         data = resp.json()
@@ -81,8 +164,50 @@ class FeishuPusher:
         self._tenant_access_token = data["tenant_access_token"]
         # token有效期2小时，缓存1.5小时
         self._token_expires_at = time.time() + 5400
+        self._save_cached_token(self._tenant_access_token, self._token_expires_at)
         return self._tenant_access_token
 
+    def _token_cache_key(self) -> str:
+        # 键中带 app_secret 的摘要：密钥轮换后旧 token 不会再被读到
+        digest = hashlib.blake2b((self.app_secret or "").encode("utf-8"), digest_size=8).hexdigest()
+        return f"{self.app_id}:{digest}"
+
+    def _load_cached_token(self) -> Optional[tuple]:
+        """读取其他进程缓存的 token（同样提前5分钟视为过期）"""
+        entry = _read_json_cache(self.TOKEN_CACHE_PATH).get(self._token_cache_key())
+        if not isinstance(entry, dict):
+            return None
+        try:
+            tok, exp = str(entry["tok"]), float(entry["exp"])
+        except Exception:
+            return None
+        if tok and time.time() < exp - 300:
+            return tok, exp
+        return None
+
+    def _save_cached_token(self, token: str, expires_at: float) -> None:
+        data = _read_json_cache(self.TOKEN_CACHE_PATH)
+        data[self._token_cache_key()] = {"tok": token, "exp": expires_at}
+        _write_json_cache(self.TOKEN_CACHE_PATH, data)
+
+    def _invalidate_cached_token(self) -> None:
+        """token 被拒绝（401）时丢弃内存和文件中的缓存，下次重新获取"""
+        data = _read_json_cache(self.TOKEN_CACHE_PATH)
+        if data.pop(self._token_cache_key(), None) is not None:
+            _write_json_cache(self.TOKEN_CACHE_PATH, data)
+        self._tenant_access_token = None
+        self._token_expires_at = 0
+
+    def _user_cache_key(self) -> str:
+        # open_id 因应用而异，因此键中包含 app_id
+        return f"{self.app_id}:{self.email or self.mobile}"
+
+    def _invalidate_cached_user_id(self) -> None:
+        if _read_json_cache(self.USER_CACHE_PATH).get("key") == self._user_cache_key():
+            _write_json_cache(self.USER_CACHE_PATH, {})
+        self.user_id = None
+        self._user_id_resolved = False
+
     def _get_user_id(self) -> str:
         """获取目标用户的open_id"""
         if self.user_id:
@@ -91,6 +216,12 @@ class FeishuPusher:
         if not self.email and not self.mobile:
             raise ValueError("未配置 FEISHU_OPEN_ID, FEISHU_EMAIL 或 FEISHU_MOBILES，无法确定接收用户")
 
+        cached = _read_json_cache(self.USER_CACHE_PATH)
+        if cached.get("key") == self._user_cache_key() and cached.get("user_id"):
+            self.user_id = str(cached["user_id"])
+            self._user_id_resolved = True
+            return self.user_id
+
         # 获取访问令牌
         token = self._get_tenant_access_token()
         headers = {
@@ -112,7 +243,7 @@ class FeishuPusher:
                 mobile = f"+86{mobile}"
             payload["mobiles"] = [mobile]
         
-        resp = requests.post(url, params=params, headers=headers, json=payload, timeout=self.timeout)
+        resp = _get_session().post(url, params=params, headers=headers, json=payload, timeout=self.timeout)
         resp.raise_for_status()
         
         data = resp.json()
@@ -130,6 +261,8 @@ class FeishuPusher:
              raise ValueError(f"{identifier} 查找结果无效 (可能用户不存在或应用无权限)")
              
         self.user_id = user_info["user_id"]
+        self._user_id_resolved = True
+        _write_json_cache(self.USER_CACHE_PATH, {"key": self._user_cache_key(), "user_id": self.user_id})
         return self.user_id
 
     def push_keywords(
@@ -152,87 +285,44 @@ class FeishuPusher:
         if isinstance(keywords, dict) and ("skills_interests" in keywords or "tools_platforms" in keywords):
             # Helper to filter and sort
             def _process_items(items, limit: Optional[int]):
-                valid = []
-                for item in items:
-                    level = str(item.get("level", "pass")).lower()
-                    weight = item.get("weight", 0.0)
-                    
-                    # Rule 1: Reject "reject" or weight < 0.05
-                    if level == "reject":
-                        continue
-                    if weight < 0.05:
-                        continue
-                        
-                    valid.append(item)
-                
-                # Rule 2: Sort by weight desc, take Top 10
-                valid.sort(key=lambda x: x.get("weight", 0), reverse=True)
+                # Rule 1: Reject "reject" or weight < 0.05
+                valid = [
+                    item for item in items
+                    if str(item.get("level", "pass")).lower() != "reject" and item.get("weight", 0.0) >= 0.05
+                ]
+                # Rule 2: Top N by weight desc (default 10); nlargest keeps ties in input order like a stable sort
                 if limit is None:
                     limit = 10
-                return valid[:limit]
+                return heapq.nlargest(limit, valid, key=lambda x: x.get("weight", 0))
 
             # New structured format
             skills = _process_items(keywords.get("skills_interests", []), skills_limit)
             tools = _process_items(keywords.get("tools_platforms", []), tools_limit)
-            
-            content_lines = [
+
+            text_content = "\n".join([
                 f"📊 **User Interest Analysis Report{title_suffix}**",
                 f"🕒 Time: {current_time}",
                 "",
-                "🎯 **Skills & Interests (The What)**"
-            ]
-            
-            if skills:
-                for i, kw in enumerate(skills, 1):
-                    level = str(kw.get("level", "pass")).lower()
-                    signal_text = "Strong" if level == "pass" else "Weak"
-                    
-                    # Step 1 base info
-                    line = f"{i}. {kw['name']} (Weight: {kw['weight']:.2f})"
-                    
-                    # Step 2 sub-line
-                    line += f"\n   └─ 矫正结果: {signal_text}"
-                        
-                    content_lines.append(line)
-            else:
-                content_lines.append("No significant skills detected.")
-                
-            content_lines.append("")
-            content_lines.append("🛠️ **Tools & Platforms (The Via)**")
-            
-            if tools:
-                for i, kw in enumerate(tools, 1):
-                    level = str(kw.get("level", "pass")).lower()
-                    signal_text = "Strong" if level == "pass" else "Weak"
-                    
-                    # Step 1 base info
-                    line = f"{i}. {kw['name']} (Weight: {kw['weight']:.2f})"
-                    
-                    # Step 2 sub-line
-                    line += f"\n   └─ 矫正结果: {signal_text}"
-                        
-                    content_lines.append(line)
-            else:
-                content_lines.append("No significant tools detected.")
-                
-            text_content = "\n".join(content_lines)
+                "🎯 **Skills & Interests (The What)**",
+                *(self._format_section(skills) or ["No significant skills detected."]),
+                "",
+                "🛠️ **Tools & Platforms (The Via)**",
+                *(self._format_section(tools) or ["No significant tools detected."]),
+            ])
             
         else:
             # Legacy list format
-            has_level = any("level" in kw for kw in keywords)
-            content_lines = [
+            level_text = self._level_text
+            text_content = "\n".join([
                 f"📊 **User Interest Analysis Report{title_suffix}**",
                 f"🕒 Time: {current_time}",
                 "",
-                "🔑 **Top Keywords**"
-            ]
-            
-            for i, kw in enumerate(keywords, 1):
-                level = kw.get("level")
-                level_text = f", Level: {level}" if has_level and level else ""
-                content_lines.append(f"{i}. {kw['name']} (Weight: {kw['weight']:.2f}{level_text})")
-                
-            text_content = "\n".join(content_lines)
+                "🔑 **Top Keywords**",
+                *(
+                    f"{i}. {kw['name']} (Weight: {kw['weight']:.2f}{level_text(kw)})"
+                    for i, kw in enumerate(keywords, 1)
+                ),
+            ])
 
         if self.mode == "bot":
             return self._push_as_bot(text_content)
@@ -257,7 +347,7 @@ class FeishuPusher:
             "content": {"text": text},
         }
 
-        resp = requests.post(self.webhook_url, json=payload, timeout=self.timeout)
+        resp = _get_session().post(self.webhook_url, json=payload, timeout=self.timeout)
         resp.raise_for_status()
         return True
 
@@ -281,25 +371,42 @@ class FeishuPusher:
             "content": json.dumps({"text": text})
         }
 
-        resp = requests.post(self.MESSAGE_URL, params=params, headers=headers, json=payload, timeout=self.timeout)
+        resp = _get_session().post(self.MESSAGE_URL, params=params, headers=headers, json=payload, timeout=self.timeout)
+        status = getattr(resp, "status_code", None)
+        # 缓存的 token 可能已失效（密钥轮换或被吊销），不再继续从文件读取
+        if status == 401:
+            self._invalidate_cached_token()
+        # 查找得到的 open_id 可能已失效（用户变更或应用更换），下次重新查找
+        if self._user_id_resolved and status in (400, 401):
+            self._invalidate_cached_user_id()
         resp.raise_for_status()
         return True
 
+    @staticmethod
+    def _level_text(kw: Dict) -> str:
+        # 只有带 level 的条目才附加 Level（没有任何条目带 level 时自然为空）
+        level = kw.get("level")
+        return f", Level: {level}" if level else ""
+
+    @staticmethod
+    def _format_section(items: List[Dict]) -> List[str]:
+        """结构化关键词的一个分区：序号、名称、权重，以及 Step 2 矫正结果子行"""
+        return [
+            f"{i}. {kw['name']} (Weight: {kw['weight']:.2f})\n"
+            f"   └─ 矫正结果: {'Strong' if str(kw.get('level', 'pass')).lower() == 'pass' else 'Weak'}"
+            for i, kw in enumerate(items, 1)
+        ]
+
     @staticmethod
     def _format_keywords(keywords: List[Dict]) -> str:
         if not keywords:
             return "关键词列表为空"
 
-        items = []
-        has_level = any("level" in kw for kw in keywords)
-        for kw in keywords[:20]:
-            name = kw.get("name", "")
-            weight = kw.get("weight", kw.get("final_weight", 0.0))
-            level = kw.get("level")
-            level_text = f", Level: {level}" if has_level and level else ""
-            items.append(f"- {name} ({weight:.2f}{level_text})")
-
-        return "关键词 (Top 20):\n" + "\n".join(items)
+        level_text = FeishuPusher._level_text
+        return "关键词 (Top 20):\n" + "\n".join(
+            f"- {kw.get('name', '')} ({kw.get('weight', kw.get('final_weight', 0.0)):.2f}{level_text(kw)})"
+            for kw in keywords[:20]
+        )
 
 
 def create_feishu_pusher(mode: str = "bot", **kwargs) -> FeishuPusher:
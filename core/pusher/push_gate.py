@@ -1,6 +1,13 @@
 from typing import Optional, Tuple
 
 
+def _flags(meta: Optional[dict], fallback_default: bool) -> Tuple[bool, bool]:
+    """(fallback_used, used_llm) from an LLM meta dict; a missing dict counts as not used."""
+    if meta is None:
+        return fallback_default, False
+    return bool(meta.get("fallback_used", fallback_default)), bool(meta.get("used_llm", False))
+
+
 def compute_feishu_push_decision(
     *,
     keyword_count: int,
@@ -8,10 +15,8 @@ def compute_feishu_push_decision(
     chatbot_meta: Optional[dict],
     push_on_llm_fallback: bool,
 ) -> Tuple[bool, str, str]:
-    llm_fallback = bool((llm_meta or {}).get("fallback_used", True))
-    llm_used = bool((llm_meta or {}).get("used_llm", False))
-    chat_fallback = bool((chatbot_meta or {}).get("fallback_used", False)) if chatbot_meta is not None else False
-    chat_used = bool((chatbot_meta or {}).get("used_llm", False)) if chatbot_meta is not None else False
+    llm_fallback, llm_used = _flags(llm_meta, True)
+    chat_fallback, chat_used = _flags(chatbot_meta, False)
     any_fallback = llm_fallback or chat_fallback
     any_used_llm = llm_used or chat_used
 
@@ -1,9 +1,24 @@
 ﻿import hashlib
 import sqlite3
+from array import array
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# One fixed stdlib algorithm: every process sharing the database must compute
+# identical fingerprints, or UNIQUE(fingerprint) stops catching re-ingested events.
+FINGERPRINT_ALGO = "blake2b_128"
+
+
+def _digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+# Adding a timedelta is cheaper per row than datetime.fromtimestamp(..., tz=...).
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 @dataclass
@@ -17,16 +32,97 @@ class LocalEvent:
     timestamp: datetime
 
 
+@dataclass
+class EventColumns:
+    """Column-oriented view of events (one list/array per field, rows in time order).
+
+    Scans over a single field (counting types, min/sum of durations) touch one
+    contiguous sequence instead of an attribute lookup per ``LocalEvent``.
+    """
+
+    event_type: List[str]
+    url: List[str]
+    title: List[str]
+    app: List[str]
+    status: List[str]
+    duration: array
+    ts_start: array
+
+    def __len__(self) -> int:
+        return len(self.event_type)
+
+
 class EventStore:
+    # Kept as constant text so sqlite3's per-connection statement cache reuses
+    # the prepared statement instead of recompiling it.
+    _READ_EVENTS_SQL = """
+        SELECT event_type, url, title, app, status, duration, ts_start
+        FROM events WHERE ts_start >= ?
+        ORDER BY ts_start ASC
+    """
+    # Host part of a stored URL ("https://host:port/path?q" -> "host:port"),
+    # matching DataCleaner.extract_domain for http(s) URLs.
+    _URL_REST_SQL = "substr(url, CASE WHEN instr(url, '://') > 0 THEN instr(url, '://') + 3 ELSE 1 END)"
+    _WEB_DOMAIN_SQL = f"lower(substr({_URL_REST_SQL}, 1, instr({_URL_REST_SQL} || '/', '/') - 1))"
+    _TOP_DOMAINS_SQL = f"""
+        SELECT {_WEB_DOMAIN_SQL} AS domain, SUM(duration) AS total, COUNT(*) AS cnt
+        FROM events WHERE event_type = 'web' AND ts_start >= ?
+        GROUP BY domain ORDER BY total DESC, domain ASC LIMIT ?
+    """
+    _TOP_APPS_SQL = """
+        SELECT app, SUM(duration) AS total, COUNT(*) AS cnt
+        FROM events WHERE event_type = 'window' AND ts_start >= ?
+        GROUP BY app ORDER BY total DESC, app ASC LIMIT ?
+    """
+    _FETCH_BATCH = 1000
+    _ANALYZE_AFTER_ROWS = 10000
+
     def __init__(self, db_path: str):
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection in autocommit mode (writes that need a
+        # transaction open it explicitly); the lock serializes threads using it.
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        # WAL is persistent in the db file and lets the analyzer read while the
+        # collector service writes; synchronous=NORMAL is safe with WAL (only the
+        # last commits may be lost on power failure) and avoids an fsync per commit.
+        for pragma in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA mmap_size=268435456",
+            "PRAGMA cache_size=-20000",
+        ):
+            self._conn.execute(pragma)
         self._init_db()
 
+    def close(self) -> None:
+        with self._lock:
+            try:
+                # Cheap; refreshes planner statistics only where they have drifted.
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+
+    def maybe_analyze(self, max_age_days: int = 7) -> bool:
+        """Run ``ANALYZE events`` if the last run is older than ``max_age_days``."""
+        with self._lock:
+            try:
+                last = float(self.get_meta("last_analyze") or 0)
+            except ValueError:
+                last = 0.0
+            now = time.time()
+            if now - last < max_age_days * 86400:
+                return False
+            self._conn.execute("ANALYZE events")
+            self.set_meta("last_analyze", str(int(now)))
+            return True
+
     def _init_db(self) -> None:
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             cursor.execute(
                 """
                 CREATE TABLE IF NOT EXISTS events (
@@ -43,7 +139,22 @@ class EventStore:
                 )
                 """
             )
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_type_time ON events(event_type, ts_start)")
+            # (event_type, ts_start) range index that also carries the columns
+            # the per-type aggregations read (url/app/duration), so they are
+            # answered from the index alone; supersedes idx_events_type_time.
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_type_cover "
+                "ON events(event_type, ts_start, url, app, duration)"
+            )
+            cursor.execute("DROP INDEX IF EXISTS idx_events_type_time")
+            # Covering index for iter_events (range scan on ts_start without
+            # visiting the table); it also serves purge_older_than, which makes
+            # the plain ts_start index redundant.
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_cover "
+                "ON events(ts_start, event_type, url, title, app, status, duration)"
+            )
+            cursor.execute("DROP INDEX IF EXISTS idx_events_time")
             cursor.execute(
                 """
                 CREATE TABLE IF NOT EXISTS meta (
@@ -52,117 +163,197 @@ class EventStore:
                 )
                 """
             )
-            conn.commit()
-        finally:
-            conn.close()
+            self._migrate_fingerprints()
+
+    def _migrate_fingerprints(self) -> None:
+        """Re-fingerprint existing rows once when upgrading from the old md5 scheme.
+
+        Without this, events re-ingested after the switch would no longer match
+        the UNIQUE fingerprint of rows written with the previous algorithm.
+        """
+        if self.get_meta("fingerprint_algo") == FINGERPRINT_ALGO:
+            return
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("SELECT id, event_type, url, title, app, ts_start FROM events").fetchall()
+            # OR REPLACE folds rows that only differed by NULL vs empty fields.
+            conn.executemany(
+                "UPDATE OR REPLACE events SET fingerprint = ? WHERE id = ?",
+                [(self._fingerprint(et, url, title, app, ts), row_id) for row_id, et, url, title, app, ts in rows],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint_algo', ?)",
+                (FINGERPRINT_ALGO,),
+            )
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
 
     @staticmethod
     def _fingerprint(event_type: str, url: str, title: str, app: str, ts_start: int) -> str:
-        raw = f"{event_type}|{url}|{title}|{app}|{ts_start}"
-        return hashlib.md5(raw.encode("utf-8")).hexdigest()
+        # A single encode of the joined text yields the same bytes as joining the
+        # encoded parts, at one allocation instead of five per event.
+        return _digest(f"{event_type}|{url or ''}|{title or ''}|{app or ''}|{ts_start}".encode("utf-8"))
+
+    @classmethod
+    def make_row(
+        cls, event_type: str, url: str, title: str, app: str, status: str, duration: int, ts_start: int
+    ) -> tuple:
+        """Build an ``insert_events_bulk`` row (``ts_start`` in epoch seconds)."""
+        duration = int(duration)
+        return (
+            event_type,
+            url,
+            title,
+            app,
+            status,
+            duration,
+            ts_start,
+            ts_start + max(0, duration),
+            cls._fingerprint(event_type, url, title, app, ts_start),
+        )
 
     def insert_events(self, events: Iterable[LocalEvent]) -> int:
-        conn = sqlite3.connect(self.db_path)
-        inserted = 0
-        try:
-            cursor = conn.cursor()
-            for ev in events:
-                ts_start = int(ev.timestamp.replace(tzinfo=timezone.utc).timestamp())
-                ts_end = ts_start + max(0, int(ev.duration))
-                fp = self._fingerprint(ev.event_type, ev.url, ev.title, ev.app, ts_start)
-                try:
-                    cursor.execute(
-                        """
-                        INSERT OR IGNORE INTO events
-                        (event_type, url, title, app, status, duration, ts_start, ts_end, fingerprint)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            ev.event_type,
-                            ev.url,
-                            ev.title,
-                            ev.app,
-                            ev.status,
-                            int(ev.duration),
-                            ts_start,
-                            ts_end,
-                            fp,
-                        ),
-                    )
-                    if cursor.rowcount == 1:
-                        inserted += 1
-                except sqlite3.IntegrityError:
-                    continue
+        make_row = self.make_row
+        return self.insert_events_bulk(
+            [
+                make_row(
+                    ev.event_type,
+                    ev.url,
+                    ev.title,
+                    ev.app,
+                    ev.status,
+                    ev.duration,
+                    int(ev.timestamp.replace(tzinfo=timezone.utc).timestamp()),
+                )
+                for ev in events
+            ]
+        )
+
+    def insert_events_bulk(self, rows: Sequence[tuple]) -> int:
+        """Insert prebuilt ``(event_type, url, title, app, status, duration, ts_start, ts_end, fingerprint)`` rows.
+
+        Lets producers that already hold plain values (e.g. browser history
+        backfills) skip building ``LocalEvent`` objects; see ``make_row``.
+        Returns the number of new rows.
+        """
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._conn
+            # One write transaction for the whole batch; INSERT OR IGNORE already
+            # skips duplicate fingerprints, so total_changes counts real inserts.
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            try:
+                conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO events
+                    (event_type, url, title, app, status, duration, ts_start, ts_end, fingerprint)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+            except Exception:
+                conn.rollback()
+                raise
+            inserted = conn.total_changes - before
             conn.commit()
-        finally:
-            conn.close()
+        # Large backfills shift the ts_start distribution the planner relies on.
+        if inserted > self._ANALYZE_AFTER_ROWS:
+            self.maybe_analyze()
         return inserted
 
+    @staticmethod
+    def _cutoff(days: int) -> int:
+        return int(time.time()) - days * 86400
+
     def purge_older_than(self, days: int) -> int:
-        cutoff = int(datetime.now(timezone.utc).timestamp()) - days * 86400
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM events WHERE ts_start < ?", (cutoff,))
-            conn.commit()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("DELETE FROM events WHERE ts_start < ?", (self._cutoff(days),))
             return cursor.rowcount
-        finally:
-            conn.close()
 
-    def read_events(self, days: int) -> list[LocalEvent]:
-        cutoff = int(datetime.now(timezone.utc).timestamp()) - days * 86400
-        conn = sqlite3.connect(self.db_path)
+    def iter_event_rows(self, days: int) -> Iterator[tuple]:
+        """Yield raw ``(event_type, url, title, app, status, duration, ts_start)`` rows in time order.
+
+        ``ts_start`` stays in epoch seconds, for consumers that never need datetimes.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(self._READ_EVENTS_SQL, (self._cutoff(days),))
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT event_type, url, title, app, status, duration, ts_start
-                FROM events WHERE ts_start >= ?
-                ORDER BY ts_start ASC
-                """,
-                (cutoff,),
-            )
-            rows = cursor.fetchall()
+            while True:
+                # The lock is only held per batch so a slow consumer does not
+                # block writers sharing this connection.
+                with self._lock:
+                    rows = cursor.fetchmany(self._FETCH_BATCH)
+                if not rows:
+                    return
+                yield from rows
         finally:
-            conn.close()
-
-        events: list[LocalEvent] = []
-        for event_type, url, title, app, status, duration, ts_start in rows:
-            dt = datetime.fromtimestamp(int(ts_start), tz=timezone.utc)
-            events.append(
-                LocalEvent(
-                    event_type=event_type,
-                    url=url or "",
-                    title=title or "",
-                    app=app or "",
-                    status=status or "",
-                    duration=int(duration or 0),
-                    timestamp=dt,
-                )
+            cursor.close()
+
+    def iter_events(self, days: int) -> Iterator[LocalEvent]:
+        """Yield events of the last ``days`` days in time order without materializing them all."""
+        for event_type, url, title, app, status, duration, ts_start in self.iter_event_rows(days):
+            yield LocalEvent(
+                event_type=event_type,
+                url=url or "",
+                title=title or "",
+                app=app or "",
+                status=status or "",
+                duration=int(duration or 0),
+                timestamp=_EPOCH + timedelta(seconds=int(ts_start)),
             )
-        return events
+
+    def read_events(self, days: int) -> list[LocalEvent]:
+        return list(self.iter_events(days))
+
+    def read_event_columns(self, days: int) -> EventColumns:
+        """Read events of the last ``days`` days as columns; ``ts_start`` stays in epoch seconds."""
+        rows = list(self.iter_event_rows(days))
+        if not rows:
+            return EventColumns([], [], [], [], [], array("q"), array("q"))
+        event_type, url, title, app, status, duration, ts_start = zip(*rows)
+        return EventColumns(
+            event_type=list(event_type),
+            url=[v or "" for v in url],
+            title=[v or "" for v in title],
+            app=[v or "" for v in app],
+            status=[v or "" for v in status],
+            duration=array("q", [int(v or 0) for v in duration]),
+            ts_start=array("q", ts_start),
+        )
+
+    def aggregate_web_by_domain(self, days: int, top_n: int = 10) -> List[Tuple[str, int, int]]:
+        """Return the ``top_n`` ``(domain, total_seconds, event_count)`` web rows, summed in SQLite."""
+        return self._aggregate(self._TOP_DOMAINS_SQL, days, top_n)
+
+    def aggregate_apps_by_duration(self, days: int, top_n: int = 10) -> List[Tuple[str, int, int]]:
+        """Return the ``top_n`` ``(app, total_seconds, event_count)`` window rows, summed in SQLite."""
+        return self._aggregate(self._TOP_APPS_SQL, days, top_n)
+
+    def _aggregate(self, sql: str, days: int, top_n: int) -> List[Tuple[str, int, int]]:
+        with self._lock:
+            rows = self._conn.execute(sql, (self._cutoff(days), int(top_n))).fetchall()
+        return [(name or "", int(total or 0), int(cnt)) for name, total, cnt in rows]
 
     def get_meta(self, key: str) -> Optional[str]:
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             cursor.execute("SELECT value FROM meta WHERE key = ?", (key,))
             row = cursor.fetchone()
             return row[0] if row else None
-        finally:
-            conn.close()
 
     def set_meta(self, key: str, value: str) -> None:
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self._lock:
+            self._conn.execute(
                 """
                 INSERT INTO meta (key, value) VALUES (?, ?)
                 ON CONFLICT(key) DO UPDATE SET value = excluded.value
                 """,
                 (key, value),
             )
-            conn.commit()
-        finally:
-            conn.close()
@@ -4,240 +4,283 @@
 
 import os
 import sys
-from collections import defaultdict
-
-# 设置UTF-8输出
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from storage.event_store import EventStore
-from llm.llm_client import LLMClient
-from pusher.feishu_pusher import FeishuPusher
 from config import AppConfig
-from cleaner.data_cleaner import DataCleaner
-from analysis.auditor import annotate_keywords
 
-# 加载配置
-config = AppConfig.from_file('config.json')
 
-# 检查命令行参数
-import sys
-if '-test' in sys.argv:
-    print('[INFO] Running in TEST mode (Manual Trigger)')
-    # 这里其实已经是手动触发脚本了，所以主要就是个提示
-    # 如果未来test_llm.py也加入定时逻辑，这里可以用来跳过
-
-llm_config = config.llm_config()
-keyword_min = llm_config.get('keyword_min', 10)
-keyword_max = llm_config.get('keyword_max', 10)
-
-print('='*60)
-print('Task 2: Check data exists and conforms to standards')
-print('='*60)
-
-# 使用脚本所在目录查找数据库，确保在任何目录运行都能找到
-base_dir = os.path.dirname(os.path.abspath(__file__))
-db_path = os.path.join(base_dir, 'local_events.db')
-
-if os.path.exists(db_path):
-    store = EventStore(db_path)
-    events = store.read_events(days=7)
-    print(f'[OK] Database file exists: {db_path}')
-    print(f'[INFO] Total events: {len(events)}')
+def main():
+    # 设置UTF-8输出（原地切换编码，不再另包一层 TextIOWrapper）
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+        sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    # 加载配置
+    config = AppConfig.from_file('config.json')
+
+    # 检查命令行参数
+    if '-test' in sys.argv:
+        print('[INFO] Running in TEST mode (Manual Trigger)')
+        # 这里其实已经是手动触发脚本了，所以主要就是个提示
+        # 如果未来test_llm.py也加入定时逻辑，这里可以用来跳过
+
+    llm_config = config.llm_config()
+    keyword_min = llm_config.get('keyword_min', 10)
+    keyword_max = llm_config.get('keyword_max', 10)
+
+    print('='*60)
+    print('Task 2: Check data exists and conforms to standards')
+    print('='*60)
+
+    # 使用脚本所在目录查找数据库，确保在任何目录运行都能找到
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    db_path = os.path.join(base_dir, 'local_events.db')
+
+    store = None
+    event_count = 0
+    try:
+        if os.path.exists(db_path):
+            store = EventStore(db_path)
+            # 数据检查只需按列扫描；LocalEvent 对象留到真正调用 LLM 时再构造
+            cols = store.read_event_columns(days=7)
+            event_count = len(cols)
+            print(f'[OK] Database file exists: {db_path}')
+            print(f'[INFO] Total events: {event_count}')
     
-    if events:
-        type_counts = {}
-        for e in events:
-            type_counts[e.event_type] = type_counts.get(e.event_type, 0) + 1
-        print(f'[INFO] Event type distribution: {type_counts}')
-        print(f'[INFO] Data validation:')
-        print(f'   - All have event_type: {all(e.event_type for e in events)}')
-        print(f'   - duration>0: {all(e.duration > 0 for e in events)}')
-        print(f'   - timestamp valid: {all(e.timestamp for e in events)}')
-    else:
-        print('[WARNING] Database is empty, no event records')
-        events = []
-else:
-    print(f'[ERROR] Database file not found: {db_path}')
-    events = []
-
-print()
-print('='*60)
-print('Task 3: Verify LLM service is callable')
-print('='*60)
-
-# 从.env加载配置
-from dotenv import load_dotenv
-load_dotenv('../.env', override=True)
-
-api_key = os.getenv('DASHSCOPE_API_KEY')
-model = 'qwen-max'
-base_url = 'https://dashscope.aliyuncs.com/compatible-mode/v1'
-
-if not api_key:
-    # 尝试从Config获取
-    key_map = {
-        "zhipu": "ZHIPU_API_KEY",
-        "doubao": "VOLCANO_API_KEY",
-        "openai": "OPENAI_API_KEY",
-        "openai_compat": "OPENAI_API_KEY",
-        "deepseek": "DEEPSEEK_API_KEY",
-        "dashscope": "DASHSCOPE_API_KEY"
-    }
-    # 从config.llm provider推断，但这里写死了provider='dashscope'
-    # 为了保持test_llm的独立性，我们手动尝试获取
-    api_key = config.get_env('DASHSCOPE_API_KEY')
-
-print(f'Provider: dashscope')
-print(f'Model: {model}')
-print(f'API Key: {api_key[:10] if api_key else "(missing)"}...')
-
-if not api_key:
-    print('[ERROR] API Key not configured')
-else:
-    print('[OK] API Key configured')
+            if event_count:
+                type_counts = dict(Counter(cols.event_type))
+                print(f'[INFO] Event type distribution: {type_counts}')
+                print(f'[INFO] Data validation:')
+                print(f'   - All have event_type: {all(cols.event_type)}')
+                print(f'   - duration>0: {min(cols.duration) > 0}')
+                print(f'   - timestamp valid: {min(cols.ts_start) > 0}')
+                # Top-N 在 SQLite 内按域名/应用聚合，只有 10 行结果回到 Python
+                print(f'[INFO] Top web domains: {store.aggregate_web_by_domain(days=7, top_n=10)}')
+                print(f'[INFO] Top apps: {store.aggregate_apps_by_duration(days=7, top_n=10)}')
+            else:
+                print('[WARNING] Database is empty, no event records')
+            del cols
+        else:
+            print(f'[ERROR] Database file not found: {db_path}')
+
+        # 没有事件就没有可分析的内容，跳过 API Key 探测和 LLM / 推送模块的加载
+        if not event_count:
+            print('[INFO] No events to analyze, exiting.')
+            return
+
+        print()
+        print('='*60)
+        print('Task 3: Verify LLM service is callable')
+        print('='*60)
+
+        # 从.env加载配置
+        from dotenv import load_dotenv
+        load_dotenv('../.env', override=True)
+
+        api_key = os.getenv('DASHSCOPE_API_KEY')
+        model = 'qwen-max'
+        base_url = 'https://dashscope.aliyuncs.com/compatible-mode/v1'
+
+        if not api_key:
+            # 尝试从Config获取
+            key_map = {
+                "zhipu": "ZHIPU_API_KEY",
+                "doubao": "VOLCANO_API_KEY",
+                "openai": "OPENAI_API_KEY",
+                "openai_compat": "OPENAI_API_KEY",
+                "deepseek": "DEEPSEEK_API_KEY",
+                "dashscope": "DASHSCOPE_API_KEY"
+            }
+            # 从config.llm provider推断，但这里写死了provider='dashscope'
+            # 为了保持test_llm的独立性，我们手动尝试获取
+            api_key = config.get_env('DASHSCOPE_API_KEY')
+
+        print(f'Provider: dashscope')
+        print(f'Model: {model}')
+        print(f'API Key: {api_key[:10] if api_key else "(missing)"}...')
+
+        if not api_key:
+            print('[ERROR] API Key not configured')
+        else:
+            print('[OK] API Key configured')
+
+            # 只有确实要调用 LLM 时才加载这些模块（requests / 分析模块导入较慢）
+            from llm.checkpoint import LLMCheckpoint
+            from llm.llm_client import LLMClient
+            from pusher.feishu_pusher import FeishuPusher
+            from cleaner.data_cleaner import DataCleaner
+            from analysis.auditor import annotate_keywords
     
-    # 创建LLM客户端
-    client = LLMClient(
-        provider='dashscope',
-        api_key=api_key,
-        model=model,
-        base_url=base_url
-    )
+            # 创建LLM客户端
+            client = LLMClient(
+                provider='dashscope',
+                api_key=api_key,
+                model=model,
+                base_url=base_url
+            )
     
-    # ========================================
-    # 使用真实数据压缩成LLM输入格式
-    # ========================================
-    print()
-    print('='*60)
-    print('Compressing real data for LLM input (using DataCleaner)...')
-    print('='*60)
+            # ========================================
+            # 使用真实数据压缩成LLM输入格式
+            # ========================================
+            print()
+            print('='*60)
+            print('Compressing real data for LLM input (using DataCleaner)...')
+            print('='*60)
     
-    # Use DataCleaner to compress data
-    # Note: DataCleaner expects objects with timestamp, duration, event_type, url, title, app, status
-    # LocalEvent (from EventStore) is compatible with ActivityWatchRecord fields required by DataCleaner
-    try:
-        compressed_data = DataCleaner.compress_data(events)
+            # Use DataCleaner to compress data
+            # Note: DataCleaner expects objects with timestamp, duration, event_type, url, title, app, status
+            # LocalEvent (from EventStore) is compatible with ActivityWatchRecord fields required by DataCleaner
+            try:
+                events = store.read_events(days=7)
+                compressed_data = DataCleaner.compress_data(events)
         
-        # Structure adaptation for LLM Prompt if needed, or just use as is.
-        # DataCleaner returns 'web', 'non_web_samples', 'meta'.
-        # The prompt expects 'web' and 'apps'. Let's alias 'non_web_samples' to 'apps' or let LLM figure it out.
-        # To be safe and consistent with prompt description, we can rename/restructure if needed.
-        # But 'non_web_samples' contains 'window' which has 'app' field. LLM usually handles this well.
+                # Structure adaptation for LLM Prompt if needed, or just use as is.
+                # DataCleaner returns 'web', 'non_web_samples', 'meta'.
+                # The prompt expects 'web' and 'apps'. Let's alias 'non_web_samples' to 'apps' or let LLM figure it out.
+                # To be safe and consistent with prompt description, we can rename/restructure if needed.
+                # But 'non_web_samples' contains 'window' which has 'app' field. LLM usually handles this well.
         
-        web_count = len(compressed_data.get('web', {}))
-        app_count = len(compressed_data.get('non_web_samples', {}).get('window', []))
+                web_count = len(compressed_data.get('web', {}))
+                app_count = len(compressed_data.get('non_web_samples', {}).get('window', []))
         
-        print(f'[INFO] Compressed data:')
-        print(f'   - Web domains: {web_count}')
-        print(f'   - Window samples: {app_count}')
-        print(f'   - Meta: {compressed_data.get("meta")}')
-        print()
+                print(f'[INFO] Compressed data:')
+                print(f'   - Web domains: {web_count}')
+                print(f'   - Window samples: {app_count}')
+                print(f'   - Meta: {compressed_data.get("meta")}')
+                print()
         
-    except Exception as e:
-        print(f'[ERROR] Data compression failed: {e}')
-        compressed_data = {}
+            except Exception as e:
+                print(f'[ERROR] Data compression failed: {e}')
+                compressed_data = {}
 
-    print()
-    print('='*60)
-    print(f'Task 4: LLM output to console (min={keyword_min}, max={keyword_max})')
-    print('='*60)
-    print('[SPEAK] Calling LLM to extract keywords...')
-    print()
-    
-    try:
-        result_data = client.extract_keywords(compressed_data, min_k=keyword_min, max_k=keyword_max)
+            print()
+            print('='*60)
+            print(f'Task 4: LLM output to console (min={keyword_min}, max={keyword_max})')
+            print('='*60)
+            print('[SPEAK] Calling LLM to extract keywords...')
+            print()
+
+            # Feishu App 模式推送前需要 tenant token（可能还要查 open_id），趁 LLM 调用期间并发获取
+            webhook_url = config.get_env("FEISHU_WEBHOOK_URL")
+            app_env = config.feishu_app_env()
+            app_pusher = None
+            feishu_prefetch = None
+            prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feishu")
+            if not webhook_url and app_env.app_id and app_env.has_target:
+                app_pusher = FeishuPusher(
+                    mode="app",
+                    app_id=app_env.app_id,
+                    app_secret=app_env.app_secret,
+                    email=app_env.email,
+                    user_id=app_env.open_id,
+                    mobile=app_env.mobiles,
+                )
+                feishu_prefetch = prefetch_pool.submit(app_pusher._get_user_id)
+            prefetch_pool.shutdown(wait=False)
+
+            # 与 main.py 共用 LLM 结果缓存：相同的压缩数据 + 参数在 TTL 内直接复用，不再请求模型
+            # （加 -no-cache 参数强制重新调用）
+            checkpoint = LLMCheckpoint.from_llm_config(llm_config, config.resolve_path)
+            if '-no-cache' in sys.argv:
+                checkpoint.enabled = False
+
+            try:
+                cache_key = checkpoint.make_key("test_llm", f"dashscope:{model}", [keyword_min, keyword_max], compressed_data)
+                result_data, _, cache_hit = checkpoint.call(
+                    cache_key,
+                    lambda: client.extract_keywords(compressed_data, min_k=keyword_min, max_k=keyword_max, return_meta=True),
+                )
+                if cache_hit:
+                    print(f'[INFO] Using cached LLM result (checkpoint {cache_key})')
         
-        keywords = [] # For pusher compatibility
+                keywords = [] # For pusher compatibility
         
-        if isinstance(result_data, dict):
-            # Step 2A: Run Auditor
-            print('[INFO] Running Step 2A: Auditor (annotate_keywords)...')
-            audited_result = annotate_keywords(result_data, compressed_data)
+                if isinstance(result_data, dict):
+                    # Step 2A: Run Auditor
+                    print('[INFO] Running Step 2A: Auditor (annotate_keywords)...')
+                    audited_result = annotate_keywords(result_data, compressed_data)
             
-            # Use audited result
-            result_data = audited_result
+                    # Use audited result
+                    result_data = audited_result
             
-            skills = result_data.get("skills_interests", [])
-            tools = result_data.get("tools_platforms", [])
+                    skills = result_data.get("skills_interests", [])
+                    tools = result_data.get("tools_platforms", [])
             
-            print('[OK] LLM + Auditor call successful!')
-            print()
+                    print('[OK] LLM + Auditor call successful!')
+                    print()
             
-            print(f'[LIST] Skills & Interests ({len(skills)}):')
-            for i, kw in enumerate(skills, 1):
-                level = kw.get('level', 'N/A').upper()
-                ev = kw.get('evidence', {})
-                print(f'   {i}. {kw["name"]} (weight: {kw["weight"]:.2f}) [{level}]')
-                if ev:
-                    print(f'      Evidence: {ev.get("support_count")} hits, {ev.get("duration_seconds", 0):.0f}s')
+                    print(f'[LIST] Skills & Interests ({len(skills)}):')
+                    for i, kw in enumerate(skills, 1):
+                        level = kw.get('level', 'N/A').upper()
+                        ev = kw.get('evidence', {})
+                        print(f'   {i}. {kw["name"]} (weight: {kw["weight"]:.2f}) [{level}]')
+                        if ev:
+                            print(f'      Evidence: {ev.get("support_count")} hits, {ev.get("duration_seconds", 0):.0f}s')
                 
-            print(f'\n[LIST] Tools & Platforms ({len(tools)}):')
-            for i, kw in enumerate(tools, 1):
-                level = kw.get('level', 'N/A').upper()
-                ev = kw.get('evidence', {})
-                print(f'   {i}. {kw["name"]} (weight: {kw["weight"]:.2f}) [{level}]')
-                if ev:
-                    print(f'      Evidence: {ev.get("support_count")} hits, {ev.get("duration_seconds", 0):.0f}s')
+                    print(f'\n[LIST] Tools & Platforms ({len(tools)}):')
+                    for i, kw in enumerate(tools, 1):
+                        level = kw.get('level', 'N/A').upper()
+                        ev = kw.get('evidence', {})
+                        print(f'   {i}. {kw["name"]} (weight: {kw["weight"]:.2f}) [{level}]')
+                        if ev:
+                            print(f'      Evidence: {ev.get("support_count")} hits, {ev.get("duration_seconds", 0):.0f}s')
             
-            keywords = result_data
+                    keywords = result_data
             
-        elif isinstance(result_data, list):
-            # Old format fallback
-            keywords = result_data
-            print('[OK] LLM call successful!')
-            print()
-            print(f'[LIST] Extracted keywords ({len(keywords)} total):')
-            for i, kw in enumerate(keywords, 1):
-                print(f'   {i}. {kw["name"]} (weight: {kw["weight"]:.2f})')
-        else:
-            print(f"[ERROR] Unexpected result format: {type(result_data)}")
-            keywords = []
+                elif isinstance(result_data, list):
+                    # Old format fallback
+                    keywords = result_data
+                    print('[OK] LLM call successful!')
+                    print()
+                    print(f'[LIST] Extracted keywords ({len(keywords)} total):')
+                    for i, kw in enumerate(keywords, 1):
+                        print(f'   {i}. {kw["name"]} (weight: {kw["weight"]:.2f})')
+                else:
+                    print(f"[ERROR] Unexpected result format: {type(result_data)}")
+                    keywords = []
 
-    except Exception as e:
-        print(f'[ERROR] LLM call failed: {e}')
-        keywords = []
+            except Exception as e:
+                print(f'[ERROR] LLM call failed: {e}')
+                keywords = []
 
-    # ========================================
-    # Task 5: Push to Feishu
-    # ========================================
-    if keywords:
-        print()
-        print('='*60)
-        print('Task 5: Push results to Feishu')
-        print('='*60)
-        
-        from pusher.feishu_pusher import FeishuPusher
+            # ========================================
+            # Task 5: Push to Feishu
+            # ========================================
+            if keywords:
+                print()
+                print('='*60)
+                print('Task 5: Push results to Feishu')
+                print('='*60)
         
-        # 优先检查是否有 webhook，如果有则使用 bot 模式（最简单）
-        webhook_url = config.get_env("FEISHU_WEBHOOK_URL")
-        app_id = config.get_env("FEISHU_APP_ID")
-        
-        try:
-            if webhook_url:
-                print('[INFO] Using Feishu Webhook mode')
-                pusher = FeishuPusher(mode="bot", webhook_url=webhook_url)
-                pusher.push_keywords(keywords)
-                print('[OK] Pushed to Feishu via Webhook')
-            elif app_id:
-                print('[INFO] Using Feishu App mode')
-                # 尝试获取 email 或 open_id 或 mobile
-                email = config.get_env("FEISHU_EMAIL")
-                open_id = config.get_env("FEISHU_OPEN_ID")
-                mobile = config.get_env("FEISHU_MOBILES")
-                app_secret = config.get_env("FEISHU_APP_SECRET")
-                
-                if not email and not open_id and not mobile:
-                     print('[WARNING] FEISHU_APP_ID is set but FEISHU_EMAIL, FEISHU_MOBILES or FEISHU_OPEN_ID is missing.')
-                     print('          Please set one of them in .env to enable App push.')
-                else:
-                    pusher = FeishuPusher(mode="app", app_id=app_id, app_secret=app_secret, email=email, user_id=open_id, mobile=mobile)
-                    pusher.push_keywords(keywords)
-                    print(f'[OK] Pushed to Feishu App (Target: {email or mobile or open_id})')
-            else:
-                print('[INFO] Feishu not configured (set FEISHU_WEBHOOK_URL or FEISHU_APP_ID in .env)')
+                # 优先检查是否有 webhook，如果有则使用 bot 模式（最简单）
+                try:
+                    if webhook_url:
+                        print('[INFO] Using Feishu Webhook mode')
+                        pusher = FeishuPusher(mode="bot", webhook_url=webhook_url)
+                        pusher.push_keywords(keywords)
+                        print('[OK] Pushed to Feishu via Webhook')
+                    elif app_env.app_id:
+                        print('[INFO] Using Feishu App mode')
+                        if app_pusher is None:
+                             print('[WARNING] FEISHU_APP_ID is set but FEISHU_EMAIL, FEISHU_MOBILES or FEISHU_OPEN_ID is missing.')
+                             print('          Please set one of them in .env to enable App push.')
+                        else:
+                            # 预取失败时推送会重新获取 token / open_id 并抛出真实错误
+                            wait([feishu_prefetch])
+                            app_pusher.push_keywords(keywords)
+                            print(f'[OK] Pushed to Feishu App (Target: {app_env.target})')
+                    else:
+                        print('[INFO] Feishu not configured (set FEISHU_WEBHOOK_URL or FEISHU_APP_ID in .env)')
                 
-        except Exception as e:
-            print(f'[ERROR] Failed to push to Feishu: {e}')
+                except Exception as e:
+                    print(f'[ERROR] Failed to push to Feishu: {e}')
+    finally:
+        # close() 时会在长连接上执行 PRAGMA optimize
+        if store is not None:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
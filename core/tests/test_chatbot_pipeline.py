@@ -28,6 +28,18 @@ class TestChatbotPipeline(unittest.TestCase):
         self.assertTrue(any(i.get("name") == "chatgpt.com" for i in tools))
         self.assertTrue(all(0.0 <= float(i.get("weight", 0.0)) <= 1.0 for i in skills))
 
+    def test_chatbot_prompt_packs_all_sessions(self):
+        from core.prompts import build_chatbot_keyword_prompt
+
+        sessions = [
+            {"session_id": "x" * 40, "domain": f"chat{i}.com", "source": "/tmp/" + "p" * 80, "compressed_text": f"topic {i} asyncio"}
+            for i in range(60)
+        ]
+        prompt = build_chatbot_keyword_prompt(sessions, skills_limit=5, tools_limit=2)
+        self.assertIn("### SESSION 1 [chat0.com]\ntopic 0 asyncio", prompt)
+        self.assertIn("### SESSION 60 [chat59.com]\ntopic 59 asyncio", prompt)
+        self.assertNotIn("session_id", prompt)
+
 
 if __name__ == "__main__":
     unittest.main()
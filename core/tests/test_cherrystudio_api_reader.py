@@ -1,10 +1,10 @@
 import json
 import os
 import threading
-import time
 import unittest
 from datetime import datetime
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
 
 from core.chat.cherrystudio_api import CherryApiConfig, extract_sessions_via_api
 
@@ -52,29 +52,31 @@ class _Handler(BaseHTTPRequestHandler):
 
 
 class TestCherryStudioApiReader(unittest.TestCase):
-    def test_extract_sessions_via_api(self):
-        httpd = HTTPServer(("127.0.0.1", 0), _Handler)
-        port = httpd.server_address[1]
-        t = threading.Thread(target=httpd.serve_forever, daemon=True)
-        t.start()
-        time.sleep(0.05)
+    @classmethod
+    def setUpClass(cls):
+        # One mock server for the whole class. The socket is already listening
+        # once HTTPServer() returns, so requests queue in the backlog until
+        # serve_forever picks them up and no startup sleep is needed. A short
+        # poll interval keeps shutdown() from waiting out the 0.5s default.
+        cls.httpd = HTTPServer(("127.0.0.1", 0), _Handler)
+        cls.base_url = f"http://127.0.0.1:{cls.httpd.server_address[1]}"
+        threading.Thread(target=cls.httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
 
-        old = dict(os.environ)
-        try:
-            os.environ["CHERRY_API_BASE"] = f"http://127.0.0.1:{port}"
+    def test_extract_sessions_via_api(self):
+        with patch.dict(os.environ, {"CHERRY_API_BASE": self.base_url}):
             os.environ.pop("CHERRY_API_HEADER", None)
             os.environ.pop("CHERRY_API_KEY", None)
             cfg = CherryApiConfig.from_env()
             sessions, meta = extract_sessions_via_api(cfg, domain="cherrystudio", days=7, max_chars=2000, debug=True)
-            self.assertEqual(meta.get("mode"), "api")
-            self.assertGreaterEqual(len(sessions), 1)
-            self.assertIn("KEY LINES:", sessions[0].compressed_text)
-            self.assertIn("https://example.com", sessions[0].compressed_text)
-        finally:
-            os.environ.clear()
-            os.environ.update(old)
-            httpd.shutdown()
-            httpd.server_close()
+        self.assertEqual(meta.get("mode"), "api")
+        self.assertGreaterEqual(len(sessions), 1)
+        self.assertIn("KEY LINES:", sessions[0].compressed_text)
+        self.assertIn("https://example.com", sessions[0].compressed_text)
 
 
 if __name__ == "__main__":
@@ -55,6 +55,72 @@ class TestCherryStudioReader(unittest.TestCase):
             except Exception:
                 pass
 
+    def test_interleaved_conversations_are_grouped(self):
+        fd, db_path = tempfile.mkstemp(prefix="cherry_", suffix=".sqlite")
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE TABLE messages (conversation_id TEXT, role TEXT, content TEXT, created_at INTEGER)")
+            base_ms = int(datetime.now().timestamp() * 1000) - 60000
+            rows = [
+                ("c2", "user", "docker compose failed", base_ms),
+                ("c1", "user", "Error: boom https://example.com", base_ms + 1000),
+                ("c2", "assistant", "Traceback: docker", base_ms + 2000),
+                ("c1", "assistant", "pip install fixed it", base_ms + 3000),
+            ]
+            conn.executemany("INSERT INTO messages VALUES (?, ?, ?, ?)", rows)
+            conn.commit()
+            conn.close()
+
+            sessions = extract_sessions(days=7, domain="cherrystudio", db_path=db_path, max_chars=2000)
+            by_conv = {s.source.rsplit("::", 1)[-1]: s.compressed_text for s in sessions}
+            self.assertEqual(sorted(by_conv), ["c1", "c2"])
+            self.assertIn("example.com", by_conv["c1"])
+            self.assertNotIn("docker", by_conv["c1"])
+            self.assertIn("docker", by_conv["c2"])
+        finally:
+            try:
+                os.remove(db_path)
+            except Exception:
+                pass
+
+    def test_keys_that_normalize_alike_form_one_session(self):
+        fd, db_path = tempfile.mkstemp(prefix="cherry_", suffix=".sqlite")
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(db_path)
+            # No declared type, so 1 stays an integer next to the text "1"
+            conn.execute("CREATE TABLE messages (conversation_id, role TEXT, content TEXT, created_at INTEGER)")
+            base_ms = int(datetime.now().timestamp() * 1000) - 60000
+            rows = [
+                (None, "user", "orphan question one", base_ms),
+                (" abc", "user", "padded id message", base_ms + 1000),
+                (1, "user", "integer id message", base_ms + 2000),
+                ("ab", "user", "sorts between the pairs", base_ms + 3000),
+                ("default", "assistant", "literal default reply", base_ms + 4000),
+                ("abc", "assistant", "plain id reply", base_ms + 5000),
+                ("1", "assistant", "text id reply", base_ms + 6000),
+            ]
+            conn.executemany("INSERT INTO messages VALUES (?, ?, ?, ?)", rows)
+            conn.commit()
+            conn.close()
+
+            sessions = extract_sessions(days=7, domain="cherrystudio", db_path=db_path, max_chars=2000)
+            by_conv = {}
+            for s in sessions:
+                by_conv.setdefault(s.source.rsplit("::", 1)[-1], []).append(s.compressed_text)
+            self.assertEqual(sorted(by_conv), ["1", "ab", "abc", "default"])
+            for conv, first, second in (("default", "orphan", "literal"), ("abc", "padded", "plain"), ("1", "integer", "text id")):
+                with self.subTest(conv=conv):
+                    self.assertEqual(len(by_conv[conv]), 1)
+                    self.assertIn(first, by_conv[conv][0])
+                    self.assertIn(second, by_conv[conv][0])
+        finally:
+            try:
+                os.remove(db_path)
+            except Exception:
+                pass
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,32 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.config import read_env_file, resolve_api_key
+
+
+class TestEnvLoading(unittest.TestCase):
+    def test_read_env_file_parses_assignments(self):
+        with tempfile.TemporaryDirectory() as td:
+            env_path = Path(td) / ".env"
+            env_path.write_text(
+                "# comment\r\nDEEPSEEK_API_KEY=\"sk-1\"\r\n  FEISHU_APP_ID = 'cli_x' \nEMPTY\nBLANK=\n",
+                encoding="utf-8-sig",
+            )
+
+            values = read_env_file(str(env_path))
+            self.assertEqual(values, {"DEEPSEEK_API_KEY": "sk-1", "FEISHU_APP_ID": "cli_x", "BLANK": ""})
+            self.assertEqual(read_env_file(str(Path(td) / "missing.env")), {})
+
+    def test_resolve_api_key_reads_live_environment(self):
+        with patch.dict(os.environ, {"DEEPSEEK_API_KEY": "from-env"}, clear=False):
+            self.assertEqual(resolve_api_key("deepseek", ""), "from-env")
+            self.assertEqual(resolve_api_key("deepseek", "configured"), "configured")
+            os.environ["DEEPSEEK_API_KEY"] = "rotated"
+            self.assertEqual(resolve_api_key("deepseek", ""), "rotated")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from core.storage.event_store import EventStore, LocalEvent
+
+
+class TestEventStore(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._td.name, "events.db")
+        self.store = EventStore(self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        self._td.cleanup()
+
+    def _events(self, n, now):
+        return [
+            LocalEvent("web", f"https://example.com/{i}", f"title {i}", "chrome", "", 30, now - timedelta(hours=i))
+            for i in range(n)
+        ]
+
+    def test_insert_counts_only_new_rows(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        events = self._events(5, now)
+        self.assertEqual(self.store.insert_events(events), 5)
+        self.assertEqual(self.store.insert_events(iter(events)), 0)
+        self.assertEqual(self.store.insert_events(events[:2] + self._events(7, now)[5:]), 2)
+        self.assertEqual(self.store.insert_events([]), 0)
+        self.assertEqual(len(self.store.read_events(days=1)), 7)
+
+    def test_bulk_rows_dedupe_against_event_inserts(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        events = self._events(3, now)
+        rows = [
+            EventStore.make_row(ev.event_type, ev.url, ev.title, ev.app, ev.status, ev.duration, int(ev.timestamp.timestamp()))
+            for ev in events
+        ]
+        self.assertEqual(self.store.insert_events_bulk(rows), 3)
+        self.assertEqual(self.store.insert_events(events), 0)
+        self.assertEqual(self.store.insert_events_bulk([]), 0)
+
+    def test_iter_events_streams_in_time_order(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.store.insert_events(self._events(5, now))
+        it = self.store.iter_events(days=1)
+        self.assertEqual(next(it).title, "title 4")
+        self.assertEqual([ev.title for ev in it], ["title 3", "title 2", "title 1", "title 0"])
+
+    def test_read_event_columns_matches_read_events(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.store.insert_events(self._events(4, now) + [LocalEvent("afk", None, None, None, "afk", 7, now)])
+        cols = self.store.read_event_columns(days=1)
+        events = self.store.read_events(days=1)
+        self.assertEqual(len(cols), 5)
+        self.assertEqual(cols.event_type, [ev.event_type for ev in events])
+        self.assertEqual(cols.url, [ev.url for ev in events])
+        self.assertEqual(list(cols.duration), [ev.duration for ev in events])
+        self.assertEqual(list(cols.ts_start), [int(ev.timestamp.timestamp()) for ev in events])
+        self.store.purge_older_than(-1)
+        self.assertEqual(len(self.store.read_event_columns(days=1)), 0)
+
+    def test_aggregates_top_domains_and_apps_in_sql(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        ts = [now - timedelta(minutes=i) for i in range(6)]
+        self.store.insert_events(
+            [
+                LocalEvent("web", "https://GitHub.com/a?x=1", "a", "chrome", "", 30, ts[0]),
+                LocalEvent("web", "https://github.com/b", "b", "chrome", "", 20, ts[1]),
+                LocalEvent("web", "http://localhost:8000", "c", "chrome", "", 40, ts[2]),
+                LocalEvent("web", "docs.python.org/3/", "d", "chrome", "", 10, ts[3]),
+                LocalEvent("window", "", "main.py", "Code.exe", "", 90, ts[4]),
+                LocalEvent("window", "", "notes", "Obsidian", "", 15, ts[5]),
+            ]
+        )
+        self.assertEqual(
+            self.store.aggregate_web_by_domain(days=1),
+            [("github.com", 50, 2), ("localhost:8000", 40, 1), ("docs.python.org", 10, 1)],
+        )
+        self.assertEqual(self.store.aggregate_web_by_domain(days=1, top_n=1), [("github.com", 50, 2)])
+        self.assertEqual(self.store.aggregate_apps_by_duration(days=1), [("Code.exe", 90, 1), ("Obsidian", 15, 1)])
+
+    def test_foreign_fingerprints_are_rewritten_and_still_dedupe(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        events = self._events(3, now)
+        self.store.insert_events(events)
+        # Simulate a database written by another fingerprint algorithm
+        self.store._conn.execute("UPDATE events SET fingerprint = 'old-' || id")
+        self.store.set_meta("fingerprint_algo", "xxh3_128")
+        self.store.close()
+
+        self.store = EventStore(self.db_path)
+        self.assertEqual(self.store.get_meta("fingerprint_algo"), "blake2b_128")
+        self.assertEqual(self.store.insert_events(events), 0)
+        self.assertEqual(len(self.store.read_events(days=1)), 3)
+
+    def test_meta_and_purge_persist_across_connections(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.store.insert_events(self._events(3, now) + [LocalEvent("app", "", "old", "x", "", 5, now - timedelta(days=10))])
+        self.store.set_meta("cursor", "1")
+        self.store.set_meta("cursor", "2")
+        self.assertEqual(self.store.purge_older_than(7), 1)
+        self.store.close()
+
+        self.store = EventStore(self.db_path)
+        self.assertEqual(self.store.get_meta("cursor"), "2")
+        self.assertIsNone(self.store.get_meta("missing"))
+        self.assertEqual(len(self.store.read_events(days=30)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
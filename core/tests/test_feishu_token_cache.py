@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core.pusher.feishu_pusher import FeishuPusher
+
+
+class TestFeishuTokenCache(unittest.TestCase):
+    def test_token_is_shared_across_instances_via_file(self):
+        calls = []
+
+        def fake_post(url, json=None, timeout=None, params=None, headers=None):
+            calls.append(url)
+            return SimpleNamespace(
+                raise_for_status=lambda: None,
+                json=lambda: {"code": 0, "tenant_access_token": "t-123"},
+            )
+
+        with tempfile.TemporaryDirectory() as td:
+            cache_path = Path(td) / "feishu_token.json"
+            with patch.object(FeishuPusher, "TOKEN_CACHE_PATH", cache_path), patch(
+                "core.pusher.feishu_pusher._get_session", return_value=SimpleNamespace(post=fake_post)
+            ):
+                first = FeishuPusher(mode="app", app_id="cli_a", app_secret="s")
+                self.assertEqual(first._get_tenant_access_token(), "t-123")
+                second = FeishuPusher(mode="app", app_id="cli_a", app_secret="s")
+                self.assertEqual(second._get_tenant_access_token(), "t-123")
+                self.assertEqual(len(calls), 1)
+                if os.name == "posix":
+                    self.assertEqual(cache_path.stat().st_mode & 0o777, 0o600)
+
+                other_app = FeishuPusher(mode="app", app_id="cli_b", app_secret="s")
+                other_app._get_tenant_access_token()
+                self.assertEqual(len(calls), 2)
+
+                second._save_cached_token("stale", time.time() + 60)
+                third = FeishuPusher(mode="app", app_id="cli_a", app_secret="s")
+                third._get_tenant_access_token()
+                self.assertEqual(len(calls), 3)
+
+                rotated = FeishuPusher(mode="app", app_id="cli_a", app_secret="s2")
+                rotated._get_tenant_access_token()
+                self.assertEqual(len(calls), 4)
+
+    def test_open_id_lookup_is_cached_and_invalidated_on_401(self):
+        calls = []
+        status = {"message": 200}
+
+        def fake_post(url, json=None, timeout=None, params=None, headers=None):
+            calls.append(url)
+            if url == FeishuPusher.TOKEN_URL:
+                body = {"code": 0, "tenant_access_token": "t-123"}
+            else:
+                body = {"code": 0, "data": {"user_list": [{"user_id": "ou_1"}]}}
+            code = status["message"] if url == FeishuPusher.MESSAGE_URL else 200
+            return SimpleNamespace(status_code=code, raise_for_status=lambda: None, json=lambda: body)
+
+        def lookups():
+            return sum(1 for url in calls if url.endswith("batch_get_id"))
+
+        with tempfile.TemporaryDirectory() as td, patch.object(
+            FeishuPusher, "TOKEN_CACHE_PATH", Path(td) / "token.json"
+        ), patch.object(FeishuPusher, "USER_CACHE_PATH", Path(td) / "user.json"), patch(
+            "core.pusher.feishu_pusher._get_session", return_value=SimpleNamespace(post=fake_post)
+        ), patch.dict(os.environ, {"FEISHU_OPEN_ID": ""}):
+            def new_pusher():
+                return FeishuPusher(mode="app", app_id="cli_a", app_secret="s", user_id="", email="a@b.c")
+
+            self.assertEqual(new_pusher()._get_user_id(), "ou_1")
+            self.assertEqual(new_pusher()._get_user_id(), "ou_1")
+            self.assertEqual(lookups(), 1)
+
+            status["message"] = 401
+            pusher = new_pusher()
+            pusher.push_text("hi")
+            self.assertIsNone(pusher.user_id)
+            self.assertIsNone(pusher._tenant_access_token)
+            new_pusher()._get_user_id()
+            self.assertEqual(lookups(), 2)
+            # The rejected token was dropped from the file cache too
+            self.assertEqual(calls.count(FeishuPusher.TOKEN_URL), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import time
+import unittest
+
+from core.llm.checkpoint import LLMCheckpoint
+
+
+class TestLLMCheckpoint(unittest.TestCase):
+    def test_hit_skips_call_and_fallback_is_not_stored(self):
+        with tempfile.TemporaryDirectory() as td:
+            cp = LLMCheckpoint(td, ttl_seconds=60)
+            key = cp.make_key("keywords", ("deepseek", "m", ""), [{"min_k": 3}, {"web": {}}])
+            calls = []
+
+            def fallback():
+                calls.append(1)
+                return ["x"], {"used_llm": False, "fallback_used": True}
+
+            def ok():
+                calls.append(1)
+                return {"skills_interests": [{"name": "Python", "weight": 1.0}]}, {"used_llm": True, "fallback_used": False}
+
+            self.assertFalse(cp.call(key, fallback)[2])
+            self.assertFalse(cp.call(key, ok)[2])
+            payload, meta, hit = cp.call(key, ok)
+            self.assertTrue(hit)
+            self.assertEqual(payload["skills_interests"][0]["name"], "Python")
+            self.assertTrue(meta["used_llm"])
+            self.assertEqual(len(calls), 2)
+
+    def test_expired_entry_is_ignored(self):
+        with tempfile.TemporaryDirectory() as td:
+            cp = LLMCheckpoint(td, ttl_seconds=60)
+            cp.save("k", [], {"used_llm": True, "fallback_used": False})
+            old = time.time() - 120
+            os.utime(os.path.join(td, "k.json"), (old, old))
+            self.assertIsNone(cp.load("k"))
+
+    def test_unserializable_payload_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as td:
+            cp = LLMCheckpoint(td, ttl_seconds=60)
+            cp.save("k", {"bad": object()}, {"used_llm": True, "fallback_used": False})
+            self.assertEqual(os.listdir(td), [])
+            self.assertIsNone(cp.load("k"))
+
+
+if __name__ == "__main__":
+    unittest.main()
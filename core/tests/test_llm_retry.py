@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+from requests.models import Response
+
+from core.llm.retry import RetryConfig, TokenBucket, with_retry
+
+
+class TestLLMRetry(unittest.TestCase):
+    def setUp(self):
+        self.delays = []
+        self.cfg = RetryConfig(max_retries=3, initial_delay=0.5, backoff_factor=2.0, max_delay=1.5)
+
+    def _run(self, results):
+        calls = iter(results)
+
+        def fn():
+            item = next(calls)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        return with_retry(fn, self.cfg, sleep=self.delays.append)
+
+    def test_retries_transient_meta_with_backoff(self):
+        busy = ([], {"used_llm": False, "fallback_used": True, "http_status": 429, "error": "x"})
+        ok = (["Python"], {"used_llm": True, "fallback_used": False, "http_status": None, "error": ""})
+        keywords, meta = self._run([busy, busy, busy, ok])
+        self.assertEqual(keywords, ["Python"])
+        self.assertTrue(meta["used_llm"])
+        self.assertEqual(self.delays, [0.5, 1.0, 1.5])
+
+    def test_does_not_retry_auth_errors(self):
+        denied = ([], {"used_llm": False, "fallback_used": True, "http_status": 401, "error": "x"})
+        _, meta = self._run([denied])
+        self.assertEqual(meta["http_status"], 401)
+        self.assertEqual(self.delays, [])
+
+    def test_gives_up_after_max_retries(self):
+        with self.assertRaises(TimeoutError):
+            self._run([TimeoutError("a")] * 4)
+        self.assertEqual(len(self.delays), 3)
+
+    def test_zhipu_http_and_timeout_failures_are_retried(self):
+        from core.llm.llm_client import LLMClient
+
+        busy = Response()
+        busy.status_code = 429
+        busy._content = b'{"error":"rate limited"}'
+        client = LLMClient(provider="zhipu", api_key="x", model="glm-4", timeout=1)
+        data = {"web": {}, "non_web_samples": {"window": [], "audio": []}}
+        for failure in ({"return_value": busy}, {"side_effect": requests.exceptions.ReadTimeout("Read timed out")}):
+            with self.subTest(failure=failure):
+                self.delays.clear()
+                with patch.object(client._session, "post", **failure) as post, patch("builtins.print"):
+                    _, meta = with_retry(lambda: client.extract_keywords(data, return_meta=True), self.cfg, sleep=self.delays.append)
+                self.assertEqual(post.call_count, 4)
+                self.assertFalse(meta["used_llm"])
+
+    def test_token_bucket_allows_burst(self):
+        bucket = TokenBucket(rate=0.001, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertLess(bucket._tokens, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
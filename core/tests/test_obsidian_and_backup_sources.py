@@ -6,11 +6,17 @@ import unittest
 import zipfile
 from pathlib import Path
 
-from core.chat.sources import collect_chat_sessions
+
+def _write_zip(path: Path, name: str, payload: str) -> None:
+    # Payloads are a few dozen bytes; store them uncompressed
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr(name, payload)
 
 
 class TestObsidianAndBackupSources(unittest.TestCase):
     def test_obsidian_source_reads_markdown(self):
+        from core.chat.sources import collect_chat_sessions
+
         with tempfile.TemporaryDirectory(prefix="obsidian_vault_") as td:
             root = Path(td) / "CherryStudio" / "2026-02-14"
             root.mkdir(parents=True, exist_ok=True)
@@ -28,16 +34,19 @@ class TestObsidianAndBackupSources(unittest.TestCase):
             self.assertEqual(len(results[0].errors), 0)
 
     def test_cherrystudio_backup_picks_latest_zip(self):
+        from core.chat.sources import collect_chat_sessions
+
         with tempfile.TemporaryDirectory(prefix="cherry_backup_") as td:
             d = Path(td)
             z1 = d / "cherry-studio.2026-02-13.zip"
             z2 = d / "cherry-studio.2026-02-14.zip"
 
-            with zipfile.ZipFile(z1, "w") as zf:
-                zf.writestr("a.json", json.dumps({"messages": [{"role": "user", "content": "old"}]}))
-            time.sleep(0.02)
-            with zipfile.ZipFile(z2, "w") as zf:
-                zf.writestr("b.json", json.dumps({"messages": [{"role": "user", "content": "new"}]}))
+            _write_zip(z1, "a.json", json.dumps({"messages": [{"role": "user", "content": "old"}]}))
+            _write_zip(z2, "b.json", json.dumps({"messages": [{"role": "user", "content": "new"}]}))
+            # Explicit mtimes instead of sleeping past the filesystem's timestamp resolution
+            t = time.time()
+            os.utime(z1, (t - 60, t - 60))
+            os.utime(z2, (t, t))
 
             sessions, results = collect_chat_sessions(
                 sources=[{"type": "cherrystudio_backup", "domain": "cherrystudio", "path": str(d)}],
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from core.cleaner.data_cleaner import DataCleaner
+from core.llm.semantic_cache import SemanticPromptCache
+from core.storage.event_store import LocalEvent
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _window(topic, domains=20, extra_title=None):
+    """Real compress_data output: ``domains`` docs pages about ``topic`` plus an editor window."""
+    events = [
+        LocalEvent(
+            "web", f"https://{topic}{d}.example.org/", f"{topic} guide {d}", "chrome.exe", "not-afk", 60, NOW + timedelta(minutes=d)
+        )
+        for d in range(domains)
+    ]
+    events.append(LocalEvent("window", "", f"main - {topic} project", "Code.exe", "not-afk", 600, NOW))
+    if extra_title:
+        events.append(LocalEvent("window", "", extra_title, "Code.exe", "not-afk", 120, NOW + timedelta(hours=2)))
+    return DataCleaner.compress_data(events)
+
+
+def _ok():
+    return {"skills_interests": [{"name": "Python", "weight": 1.0}]}, {"used_llm": True, "fallback_used": False}
+
+
+class TestSemanticPromptCache(unittest.TestCase):
+    def test_near_duplicate_hits_and_distinct_scope_misses(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = SemanticPromptCache(os.path.join(td, "sc.db"), threshold=0.9, ttl_seconds=60)
+            calls = []
+
+            def ok():
+                calls.append(1)
+                return _ok()
+
+            self.assertIsNone(cache.call("s1", _window("python"), ok)[2])
+            payload, meta, score = cache.call("s1", _window("python", extra_title="utils.py"), ok)
+            self.assertIsNotNone(score)
+            self.assertGreaterEqual(score, 0.9)
+            self.assertEqual(payload["skills_interests"][0]["name"], "Python")
+            self.assertEqual(cache.call("s1", _window("python"), ok)[2], 1.0)
+            self.assertIsNone(cache.call("s2", _window("python"), ok)[2])
+            self.assertEqual(len(calls), 2)
+
+    def test_unrelated_windows_miss_at_default_threshold(self):
+        # Same compress_data layout, no shared domains or titles: the repeated
+        # schema keys alone must not make these look like near-duplicates.
+        with tempfile.TemporaryDirectory() as td:
+            cache = SemanticPromptCache(os.path.join(td, "sc.db"), ttl_seconds=60)
+            cache.save("s", _window("python"), *_ok())
+            self.assertIsNone(cache.lookup("s", _window("rust")))
+
+    def test_fallback_results_are_not_stored(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = SemanticPromptCache(os.path.join(td, "sc.db"), threshold=0.9, ttl_seconds=60)
+            cache.call("s", _window("python"), lambda: ([], {"used_llm": False, "fallback_used": True}))
+            self.assertIsNone(cache.lookup("s", _window("python")))
+
+
+if __name__ == "__main__":
+    unittest.main()
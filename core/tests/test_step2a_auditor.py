@@ -1,22 +1,14 @@
-
-import sys
-import os
-import json
-
-# Ensure we can import core modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import unittest
 
 from core.analysis.auditor import annotate_keywords
 
-def run_integration_test():
-    print(">>> Starting Step 2A Auditor Integration Test")
 
-    # 1. Mock Compressed Data (User Behavior)
-    # Scenario:
-    # - High usage: "Python" (VS Code, Docs)
-    # - Medium usage: "Docker" (CLI, Docs)
-    # - Noise/No usage: "React" (Not in data)
-    mock_data = {
+# Scenario:
+# - High usage: "Python" (VS Code, Docs)
+# - Medium usage: "Docker" (CLI, Docs)
+# - Noise/No usage: "React" (Not in data)
+def _mock_data():
+    return {
         "web": {
             "chrome.exe": {
                 "title_freq": {
@@ -38,52 +30,40 @@ def run_integration_test():
         }
     }
 
-    # 2. Mock LLM Candidates (Input)
-    # - "Python": Strong evidence (Web + VS Code) -> Should PASS
-    # - "Docker": Medium evidence (Web + Cmd) -> Should PASS or WEAK (depending on threshold)
-    # - "React": Hallucination (No evidence) -> Should REJECT
-    # - "Spotify": Non-skill (Present but maybe low semantic relevance, but Auditor only checks evidence presence first) -> Should PASS (Auditor measures 'Truth', semantic filtering is LLM's job or Consistency's job)
-    
-    mock_keywords = [
-        {"name": "Python", "category": "Skill"},
-        {"name": "Docker", "category": "Tool"},
-        {"name": "React", "category": "Skill"}, # Hallucination
-    ]
 
-    # 3. Run Auditor
-    print(f"[-] Input Keywords: {[k['name'] for k in mock_keywords]}")
-    print("[-] Running annotate_keywords...")
-    
-    # We simulate consistency_runs being identical to input for simplicity, 
-    # meaning LLM is consistently saying these are the skills.
-    consistency_runs = [["Python", "Docker", "React"], ["Python", "Docker", "React"]]
-    
-    results = annotate_keywords(mock_keywords, mock_data, consistency_runs)
+# LLM candidates:
+# - "Python": Strong evidence (Web + VS Code) -> PASS
+# - "Docker": Medium evidence (Web + Cmd) -> PASS or WEAK (depending on threshold)
+# - "React": Hallucination (No evidence) -> REJECT
+MOCK_KEYWORDS = [
+    {"name": "Python", "category": "Skill"},
+    {"name": "Docker", "category": "Tool"},
+    {"name": "React", "category": "Skill"},  # Hallucination
+]
+
+# Consistency runs identical to the input: the LLM keeps naming the same skills.
+CONSISTENCY_RUNS = [["Python", "Docker", "React"], ["Python", "Docker", "React"]]
+
+
+class TestStep2AAuditor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The auditor runs once; every test below only inspects its output.
+        results = annotate_keywords(MOCK_KEYWORDS, _mock_data(), CONSISTENCY_RUNS)
+        cls.by_name = {res["name"]: res for res in results}
+
+    def test_levels(self):
+        for name, expected in (("Python", {"pass"}), ("Docker", {"pass", "weak"}), ("React", {"reject"})):
+            with self.subTest(name=name):
+                self.assertIn(self.by_name[name]["level"], expected)
 
-    # 4. Verify Results
-    print("\n>>> Audit Results:")
-    for res in results:
-        name = res.get("name")
-        level = res.get("level")
-        evidence = res.get("evidence", {})
-        scores = res.get("scores", {})
-        
-        print(f"[{level.upper()}] {name}")
-        print(f"    Evidence: Count={evidence.get('support_count')}, Dur={evidence.get('duration_seconds'):.1f}s")
-        print(f"    Scores:   Ev={scores.get('evidence')}, Con={scores.get('consistency')}")
+    def test_evidence_follows_usage(self):
+        python, docker, react = (self.by_name[n]["evidence"] for n in ("Python", "Docker", "React"))
+        self.assertGreater(python["support_count"], docker["support_count"])
+        self.assertGreater(python["duration_seconds"], docker["duration_seconds"])
+        self.assertEqual(react["support_count"], 0)
+        self.assertEqual(self.by_name["React"]["scores"]["evidence"], 0.0)
 
-        # Assertions
-        if name == "Python":
-            if level != "pass":
-                print(f"[FAIL] Python should be PASS, got {level}")
-            else:
-                print("[OK] Python is PASS")
-        
-        if name == "React":
-            if level != "reject":
-                print(f"[FAIL] React should be REJECT (no evidence), got {level}")
-            else:
-                print("[OK] React is REJECT")
 
 if __name__ == "__main__":
-    run_integration_test()
+    unittest.main()
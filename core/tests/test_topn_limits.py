@@ -1,7 +1,16 @@
+import copy
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch
 
 
+# Shared, read-only input: push_keywords must not mutate it (checked below).
+KEYWORDS_20 = {
+    "skills_interests": [{"name": f"Skill{i}", "weight": 0.9 - i * 0.01, "level": "pass"} for i in range(20)],
+    "tools_platforms": [{"name": f"Tool{i}", "weight": 0.8 - i * 0.01, "level": "pass"} for i in range(20)],
+}
+
+
 class TestTopNLimits(unittest.TestCase):
     def test_prompt_supports_separate_limits(self):
         from core.prompts import build_keyword_extraction_prompt
@@ -24,14 +33,26 @@ class TestTopNLimits(unittest.TestCase):
         self.assertIn("Skills & Interests Top 5", prompt_default)
         self.assertIn("Tools & Platforms Top 5", prompt_default)
 
-    def test_feishu_pusher_truncates_structured_keywords(self):
-        from core.pusher.feishu_pusher import FeishuPusher
+    def test_prompt_drops_noise_titles_without_mutating_input(self):
+        from core.prompts import build_keyword_extraction_prompt
 
-        keywords = {
-            "skills_interests": [{"name": f"Skill{i}", "weight": 0.9 - i * 0.01, "level": "pass"} for i in range(20)],
-            "tools_platforms": [{"name": f"Tool{i}", "weight": 0.8 - i * 0.01, "level": "pass"} for i in range(20)],
+        data = {
+            "web": {"github.com": {"title_samples": ["New Tab", "react-repo"], "title_freq": {"Home": 3, "react-repo": 1}}},
+            "non_web_samples": {"window": [{"app": "Trae AI", "duration": 60, "titles": ["main.py", "cmd"]}]},
+            "meta": {},
         }
+        prompt = build_keyword_extraction_prompt(data, min_k=3, max_k=10)
+        self.assertIn("react-repo", prompt)
+        self.assertIn("main.py", prompt)
+        self.assertNotIn("New Tab", prompt)
+        self.assertNotIn('"Home"', prompt)
+        self.assertNotIn('"cmd"', prompt)
+        self.assertEqual(data["non_web_samples"]["window"][0]["titles"], ["main.py", "cmd"])
+
+    def test_feishu_pusher_truncates_structured_keywords(self):
+        from core.pusher.feishu_pusher import FeishuPusher
 
+        before = copy.deepcopy(KEYWORDS_20)
         captured = {}
 
         def fake_post(url, json=None, timeout=None, params=None, headers=None):
@@ -43,9 +64,9 @@ class TestTopNLimits(unittest.TestCase):
             return Resp()
 
         pusher = FeishuPusher(mode="bot", webhook_url="https://example.invalid/webhook")
-        with patch("core.pusher.feishu_pusher.requests.post", new=fake_post):
+        with patch("core.pusher.feishu_pusher._get_session", return_value=SimpleNamespace(post=fake_post)):
             ok = pusher.push_keywords(
-                keywords,
+                KEYWORDS_20,
                 title_suffix=" (Past 7 Days)",
                 skills_limit=10,
                 tools_limit=5,
@@ -61,6 +82,7 @@ class TestTopNLimits(unittest.TestCase):
         self.assertIn("1. Tool0", text)
         self.assertIn("5. Tool4", text)
         self.assertNotIn("6. Tool5", text)
+        self.assertEqual(KEYWORDS_20, before)
 
     def test_feishu_pusher_keeps_filtering_behavior(self):
         from core.pusher.feishu_pusher import FeishuPusher
@@ -87,7 +109,7 @@ class TestTopNLimits(unittest.TestCase):
             return Resp()
 
         pusher = FeishuPusher(mode="bot", webhook_url="https://example.invalid/webhook")
-        with patch("core.pusher.feishu_pusher.requests.post", new=fake_post):
+        with patch("core.pusher.feishu_pusher._get_session", return_value=SimpleNamespace(post=fake_post)):
             ok = pusher.push_keywords(keywords, skills_limit=10, tools_limit=10)
         self.assertTrue(ok)
         text = (captured.get("json") or {}).get("content", {}).get("text", "")
@@ -1,24 +1,72 @@
+import json
+import random
+from itertools import chain
 from typing import List, Dict
 
-from pyecharts.charts import WordCloud
-from pyecharts import options as opts
+__all__ = ["WordCloudGenerator"]
+
+# The chart is always one "keywords" word-cloud series under a fixed title, so
+# the page is a static shell with the ECharts option injected as JSON (same
+# ECharts builds and chart options the pyecharts render used to emit).
+_ASSETS_HOST = "https://assets.pyecharts.org/assets/v6"
+_TITLE = "JobInsight Keywords"
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    <script type="text/javascript" src="{assets}/echarts.min.js"></script>
+    <script type="text/javascript" src="{assets}/echarts-wordcloud.min.js"></script>
+</head>
+<body>
+    <div id="wordcloud" class="chart-container" style="width:900px; height:500px;"></div>
+    <script>
+        var chart = echarts.init(document.getElementById('wordcloud'), 'white', {{renderer: 'canvas', locale: 'ZH'}});
+        chart.setOption({option});
+    </script>
+</body>
+</html>
+"""
+
+
+def _score(weight) -> float:
+    # Weights parsed from LLM JSON are already floats; only convert the rest
+    # (ints, numeric strings, and null, which falls back to the 0.5 default).
+    if type(weight) is not float:
+        weight = float(0.5 if weight is None else weight)
+    return weight * 100
+
+
+def _random_color() -> str:
+    return "rgb({},{},{})".format(random.randint(0, 160), random.randint(0, 160), random.randint(0, 160))
 
 
 class WordCloudGenerator:
     def generate(self, keywords: List[Dict], output_file: str) -> None:
         if isinstance(keywords, dict):
-            # Flatten structured keywords
-            flat_keywords = []
-            if "skills_interests" in keywords:
-                flat_keywords.extend(keywords.get("skills_interests", []))
-            if "tools_platforms" in keywords:
-                flat_keywords.extend(keywords.get("tools_platforms", []))
-            keywords = flat_keywords
-
-        data = [(kw.get("name", ""), float(kw.get("weight", 0.5)) * 100) for kw in keywords]
-        wc = (
-            WordCloud()
-            .add("keywords", data, word_size_range=[12, 80])
-            .set_global_opts(title_opts=opts.TitleOpts(title="JobInsight Keywords"))
-        )
-        wc.render(output_file)
+            # Flatten structured keywords lazily into the comprehension below
+            keywords = chain(keywords.get("skills_interests") or (), keywords.get("tools_platforms") or ())
+
+        data = [
+            {"name": kw.get("name", ""), "value": _score(kw.get("weight", 0.5)), "textStyle": {"color": _random_color()}}
+            for kw in keywords
+        ]
+        option = {
+            "series": [
+                {
+                    "type": "wordCloud",
+                    "name": "keywords",
+                    "shape": "circle",
+                    "rotationRange": [-90, 90],
+                    "rotationStep": 45,
+                    "sizeRange": [12, 80],
+                    "data": data,
+                }
+            ],
+            "tooltip": {"show": True},
+            "title": [{"show": True, "text": _TITLE}],
+        }
+        # Escape "</" so a keyword can never close the inline <script> early
+        option_json = json.dumps(option, ensure_ascii=False).replace("</", "<\\/")
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(_HTML_TEMPLATE.format(title=_TITLE, assets=_ASSETS_HOST, option=option_json))